@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import random
+from app.game_logic import MemoryGameLogic
+
+TABLE_FILE = os.path.join(os.path.dirname(__file__), "data", "baseline_moves.json")
+TABLE_MAX_PAIRS = 64
+
+_expected = None
+
+def solve_expected_moves(max_pairs):
+    """Expected moves for 0..max_pairs pairs under perfect-memory play.
+
+    State (u, k): u cards never seen, k of them partners of seen cards.
+    Each move flips an unseen card; if its partner is known it is matched,
+    otherwise a second unseen card is flipped. Missing with the partner of
+    an earlier card costs one extra move to collect that known pair.
+    """
+    max_unseen = 2 * max_pairs
+    expected = [[0.0] * (max_unseen + 1) for _ in range(max_unseen + 1)]
+    for u in range(1, max_unseen + 1):
+        for k in range(u % 2, min(u, max_unseen - u) + 1, 2):
+            value = 0.0
+            if k:
+                value += k / u * (1 + expected[u - 1][k - 1])
+            if u > k:
+                new = (u - k) / u
+                value += new / (u - 1) * (1 + expected[u - 2][k])
+                if k:
+                    value += new * k / (u - 1) * (2 + expected[u - 2][k])
+                if u - 2 - k > 0:
+                    value += new * (u - 2 - k) / (u - 1) * (1 + expected[u - 2][k + 2])
+            expected[u][k] = value
+    return [expected[2 * n][0] for n in range(max_pairs + 1)]
+
+def simulate_moves(num_pairs, games=1000, seed=None):
+    """Average moves of a perfect-memory player over shuffled MemoryGameLogic boards"""
+    rng = random.Random(seed)
+    pairs = [(f"t{i}", f"d{i}") for i in range(num_pairs)]
+    total = 0
+    for _ in range(games):
+        logic = MemoryGameLogic(pairs)
+        partner = {**logic.pairs, **logic.inverse_pairs}
+        unseen = list(logic.blocks)
+        rng.shuffle(unseen)
+        seen = {}
+        moves = 0
+        while not logic.has_won():
+            moves += 1
+            known = next((v for v in seen if partner[v] in seen), None)
+            if known is not None:
+                first, second = seen.pop(known), seen.pop(partner[known])
+            else:
+                first = unseen.pop()
+                value = logic.get_value(first)
+                if partner[value] in seen:
+                    second = seen.pop(partner[value])
+                else:
+                    second = unseen.pop()
+                    if not logic.check_match(value, logic.get_value(second)):
+                        seen[value] = first
+                        seen[logic.get_value(second)] = second
+                        continue
+            logic.remove_blocks(first, second)
+        total += moves
+    return total / games
+
+def _load_table():
+    try:
+        with open(TABLE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)['expected']
+    except Exception as e:
+        print(f"Error loading baseline table: {e}")
+        return solve_expected_moves(TABLE_MAX_PAIRS)
+
+def expected_moves(num_pairs):
+    """Expected moves for a perfect-memory player; a table lookup after the first call"""
+    global _expected
+    if _expected is None:
+        _expected = _load_table()
+    if num_pairs >= len(_expected):
+        # Extend the shipped table for unusually large boards
+        _expected = solve_expected_moves(max(num_pairs, 2 * (len(_expected) - 1)))
+    return _expected[num_pairs]
+
+def minimum_moves(num_pairs):
+    """Fewest possible moves: every pair found on its first attempt"""
+    return num_pairs
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the perfect-memory baseline move table")
+    parser.add_argument("--max-pairs", type=int, default=TABLE_MAX_PAIRS)
+    parser.add_argument("--verify", type=int, default=0, metavar="GAMES",
+                        help="compare with a Monte Carlo run of this many games per size")
+    args = parser.parse_args()
+
+    expected = solve_expected_moves(args.max_pairs)
+    if args.verify:
+        for num_pairs in (2, 4, 8, 16, 32):
+            if num_pairs <= args.max_pairs:
+                simulated = simulate_moves(num_pairs, args.verify, seed=num_pairs)
+                print(f"{num_pairs:3d} pairs: exact {expected[num_pairs]:.3f}, simulated {simulated:.3f}")
+
+    os.makedirs(os.path.dirname(TABLE_FILE), exist_ok=True)
+    with open(TABLE_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'expected': [round(value, 4) for value in expected]}, f, indent=1)
+    print(f"Wrote {TABLE_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import json
+import os
+
+# The journal is flushed on every move; fsync is paid only every few moves
+FSYNC_EVERY_MOVES = 5
+
+class GameCheckpoint:
+    def __init__(self, filename="checkpoint"):
+        self.base_file = filename + ".json"
+        self.journal_file = filename + ".journal"
+        self._journal = None
+        self._unsynced = 0
+
+    def start(self, state):
+        """Write the base snapshot of a new game and start an empty journal"""
+        self.close()
+        try:
+            tmp_name = self.base_file + ".tmp"
+            with open(tmp_name, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            # Truncate the old journal before the new base becomes visible
+            open(self.journal_file, 'w').close()
+            os.replace(tmp_name, self.base_file)
+            self._journal = open(self.journal_file, 'a', encoding='utf-8')
+        except Exception as e:
+            print(f"Error writing checkpoint: {e}")
+            self._journal = None
+
+    def resume(self, journal_size):
+        """Keep appending after the last consistent record of a resumed game"""
+        self.close()
+        try:
+            if os.path.exists(self.journal_file):
+                os.truncate(self.journal_file, journal_size)
+            self._journal = open(self.journal_file, 'a', encoding='utf-8')
+        except Exception as e:
+            print(f"Error opening checkpoint journal: {e}")
+
+    def record_move(self, first, second, matched, moves, elapsed):
+        """Append one completed move; a short line, never a full rewrite"""
+        if self._journal is None:
+            return
+        try:
+            self._journal.write(f"{first},{second},{int(matched)},{moves},{elapsed}\n")
+            self._journal.flush()
+            self._unsynced += 1
+            if self._unsynced >= FSYNC_EVERY_MOVES:
+                os.fsync(self._journal.fileno())
+                self._unsynced = 0
+        except Exception as e:
+            print(f"Error writing checkpoint journal: {e}")
+
+    def load(self):
+        """Return the last consistent state of an unfinished game, or None"""
+        try:
+            with open(self.base_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error loading checkpoint: {e}")
+            return None
+
+        state['matched'] = []
+        state['moves'] = 0
+        state['elapsed'] = 0
+        state['journal_size'] = 0
+        try:
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    # A torn final line from a crash ends the replay
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        first, second, matched, moves, elapsed = (int(v) for v in line.split(b","))
+                    except ValueError:
+                        break
+                    if matched:
+                        state['matched'] += [first, second]
+                    state['moves'] = moves
+                    state['elapsed'] = elapsed
+                    state['journal_size'] += len(line)
+        except FileNotFoundError:
+            pass
+        return state
+
+    def close(self):
+        if self._journal is not None:
+            try:
+                self._journal.close()
+            except Exception as e:
+                print(f"Error closing checkpoint journal: {e}")
+            self._journal = None
+        self._unsynced = 0
+
+    def clear(self):
+        """Forget the checkpoint once a game is finished or abandoned"""
+        self.close()
+        for filename in (self.base_file, self.journal_file):
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error removing checkpoint: {e}")
@@ -0,0 +1,107 @@
+import argparse
+import hashlib
+import heapq
+import json
+import os
+from collections import Counter, defaultdict
+
+def deck_pairs(pairs):
+    """Canonical pair order of a deck, independent of how it was entered"""
+    return sorted(dict(pairs).items())
+
+def deck_id(pairs):
+    """Content hash that identifies a deck across players and sessions"""
+    data = json.dumps(deck_pairs(pairs), ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+def card_ids(pairs):
+    """Map card values to ids: 2 * pair index for terms, 2 * pair index + 1 for definitions"""
+    ids = {}
+    for i, (term, definition) in enumerate(deck_pairs(pairs)):
+        ids.setdefault(term, 2 * i)
+        ids.setdefault(definition, 2 * i + 1)
+    return ids
+
+def card_value(pairs, card):
+    return pairs[card // 2][card % 2]
+
+class ConfusionTracker:
+    def __init__(self, directory="confusion"):
+        self.directory = directory
+        self._decks = {}
+        self._pending = defaultdict(Counter)
+
+    def record(self, deck, first_card, second_card):
+        """Count one mismatch in memory; nothing touches disk until flush()"""
+        if first_card > second_card:
+            first_card, second_card = second_card, first_card
+        self._pending[deck][f"{first_card},{second_card}"] += 1
+
+    def flush(self, deck, pairs):
+        """Merge the mismatches recorded for a deck into its file"""
+        pending = self._pending.pop(deck, None)
+        if not pending:
+            return
+        # Re-read so counts flushed by other processes are kept
+        self._decks.pop(deck, None)
+        data = self._load(deck)
+        data['pairs'] = [list(pair) for pair in deck_pairs(pairs)]
+        data['counts'].update(pending)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            filename = os.path.join(self.directory, deck + ".json")
+            tmp_name = filename + ".tmp"
+            with open(tmp_name, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_name, filename)
+        except Exception as e:
+            print(f"Error saving confusion counts: {e}")
+
+    def _load(self, deck):
+        """Counters of one deck, cached after the first read"""
+        if deck not in self._decks:
+            data = {'pairs': [], 'counts': Counter()}
+            try:
+                with open(os.path.join(self.directory, deck + ".json"), 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                data['pairs'] = stored['pairs']
+                data['counts'] = Counter(stored['counts'])
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error loading confusion counts: {e}")
+            self._decks[deck] = data
+        return self._decks[deck]
+
+    def decks(self):
+        """Ids of every deck with recorded confusions"""
+        try:
+            return [name[:-5] for name in os.listdir(self.directory) if name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+
+    def top_confusions(self, limit=20, deck=None):
+        """Most confused card pairs as (count, first value, second value)"""
+        def entries(deck):
+            data = self._load(deck)
+            for key, count in data['counts'].items():
+                first, second = (int(card) for card in key.split(","))
+                yield count, data['pairs'], first, second
+
+        decks = [deck] if deck else self.decks()
+        top = heapq.nlargest(limit, (entry for deck in decks for entry in entries(deck)),
+                             key=lambda entry: entry[0])
+        return [(count, card_value(pairs, first), card_value(pairs, second))
+                for count, pairs, first, second in top]
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the most confused card pairs across all players")
+    parser.add_argument("--directory", default="confusion")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    for count, first, second in ConfusionTracker(args.directory).top_confusions(args.limit):
+        print(f"{count:8d}  {first} ↔ {second}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import argparse
+import codecs
+import csv
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Rows validated per worker task, and longest accepted card text
+CHUNK_SIZE = 2000
+MAX_FIELD_LENGTH = 500
+# Bytes inspected to guess the encoding before streaming the rest
+SNIFF_BYTES = 64 * 1024
+
+FORMATS = ("csv", "tsv", "anki")
+ANKI_SEPARATORS = {"tab": "\t", "comma": ",", "semicolon": ";", "pipe": "|", "colon": ":", "space": " "}
+# Anki header keys naming columns that hold note metadata rather than fields
+ANKI_META_COLUMNS = ("guid column", "notetype column", "deck column", "tags column")
+HTML_TAG = re.compile(r"<[^>]+>")
+HTML_BREAK = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+
+def detect_encoding(path):
+    """Guess a file's encoding from its BOM and first bytes"""
+    with open(path, 'rb') as f:
+        sample = f.read(SNIFF_BYTES)
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp1252"
+
+def detect_format(path):
+    """Pick the input format from the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".tsv", ".tab"):
+        return "tsv"
+    return "anki"
+
+def _read_anki_header(f):
+    """Parse the "#key:value" lines an Anki export starts with
+
+    Returns the settings and the first note line ("" for an empty export).
+    Without an #html line the text is treated as HTML, as Anki exports it.
+    """
+    header = {'separator': "\t", 'html': True, 'meta_columns': set()}
+    line = f.readline()
+    while line.startswith("#"):
+        key, _, value = line[1:].strip().partition(":")
+        if key == "separator":
+            header['separator'] = ANKI_SEPARATORS.get(value.lower(), value[:1] or "\t")
+        elif key == "html":
+            header['html'] = value.strip().lower() == "true"
+        elif key in ANKI_META_COLUMNS and value.strip().isdigit():
+            # Columns are numbered from 1
+            header['meta_columns'].add(int(value) - 1)
+        line = f.readline()
+    return header, line
+
+def anki_header(path, encoding=None):
+    """Settings from the header of an Anki plain-text export"""
+    encoding = encoding or detect_encoding(path)
+    with open(path, 'r', encoding=encoding, errors="replace", newline="") as f:
+        return _read_anki_header(f)[0]
+
+def read_rows(path, fmt, encoding=None):
+    """Stream (term, definition) rows from a CSV, TSV or Anki plain-text export"""
+    encoding = encoding or detect_encoding(path)
+    with open(path, 'r', encoding=encoding, errors="replace", newline="") as f:
+        delimiter = {"csv": ",", "tsv": "\t"}.get(fmt, "\t")
+        meta_columns = ()
+        if fmt == "anki":
+            header, line = _read_anki_header(f)
+            delimiter = header['separator']
+            meta_columns = header['meta_columns']
+            lines = _prepend(line, f) if line else iter(())
+        else:
+            lines = f
+        for row in csv.reader(lines, delimiter=delimiter):
+            if meta_columns:
+                # Term and definition are the first two note fields
+                row = [field for i, field in enumerate(row) if i not in meta_columns]
+            if len(row) >= 2:
+                yield row[0], row[1]
+            elif row:
+                yield row[0], ""
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
+
+def normalize(text, strip_html=False):
+    """NFC-normalize, optionally drop HTML markup, and collapse whitespace"""
+    if strip_html:
+        text = html.unescape(HTML_TAG.sub("", HTML_BREAK.sub(" ", text)))
+    text = unicodedata.normalize("NFC", text)
+    return " ".join(text.split())
+
+def encode_pair(term, definition):
+    """JSON for one pair, laid out as json.dump(pairs, indent=4) in _save_set does"""
+    return ("[\n        " + json.dumps(term, ensure_ascii=False) + ",\n        "
+            + json.dumps(definition, ensure_ascii=False) + "\n    ]")
+
+def validate_chunk(rows, strip_html=False):
+    """Worker: normalize and encode a chunk of rows
+
+    Returns ([(term digest, encoded pair), ...], invalid row count), so the
+    parent process only deduplicates digests and writes.
+    """
+    valid = []
+    invalid = 0
+    for term, definition in rows:
+        term = normalize(term, strip_html)
+        definition = normalize(definition, strip_html)
+        if not term or not definition or max(len(term), len(definition)) > MAX_FIELD_LENGTH:
+            invalid += 1
+            continue
+        digest = hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest()
+        valid.append((digest, encode_pair(term, definition)))
+    return valid, invalid
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _validated_chunks(chunks, workers, strip_html):
+    """Validate chunks in worker processes, keeping only a few in flight and their order"""
+    if workers <= 1:
+        for chunk in chunks:
+            yield validate_chunk(chunk, strip_html)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(validate_chunk, chunk, strip_html))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+def convert(input_path, output_path, fmt=None, encoding=None, workers=None,
+            chunk_size=CHUNK_SIZE, skip_header=False):
+    """Convert a deck export into the JSON pair list used by Save Set / Load Set"""
+    fmt = fmt or detect_format(input_path)
+    encoding = encoding or detect_encoding(input_path)
+    workers = workers or os.cpu_count() or 1
+    # Markup is only removed from Anki exports that contain HTML
+    strip_html = fmt == "anki" and anki_header(input_path, encoding)['html']
+    rows = read_rows(input_path, fmt, encoding)
+    if skip_header:
+        next(rows, None)
+
+    # Only a digest of each normalized term is kept for deduplication: a deck
+    # can't hold two pairs with the same term. Matching is case-sensitive,
+    # like MemoryGameLogic, so "Apple" and "apple" are both kept.
+    seen = set()
+    stats = {'rows': 0, 'written': 0, 'invalid': 0, 'duplicates': 0}
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        out.write("[")
+        for valid, invalid in _validated_chunks(_chunks(rows, chunk_size), workers, strip_html):
+            stats['rows'] += len(valid) + invalid
+            stats['invalid'] += invalid
+            parts = []
+            for digest, pair in valid:
+                if digest in seen:
+                    stats['duplicates'] += 1
+                    continue
+                seen.add(digest)
+                parts.append(pair)
+            if parts:
+                out.write(("," if stats['written'] else "") + "\n    " + ",\n    ".join(parts))
+                stats['written'] += len(parts)
+        out.write("\n]" if stats['written'] else "]")
+    os.replace(tmp_path, output_path)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert CSV, TSV or Anki text exports into a Memo Trainer set")
+    parser.add_argument("input", help="deck export to convert")
+    parser.add_argument("-o", "--output", help="JSON set to write (default: input name with .json)")
+    parser.add_argument("--format", choices=FORMATS, help="input format (default: from the extension)")
+    parser.add_argument("--encoding", help="input encoding (default: detected)")
+    parser.add_argument("--workers", type=int, help="validation processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows per validation task")
+    parser.add_argument("--skip-header", action="store_true", help="ignore the first row")
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.input)[0] + ".json"
+    start = time.perf_counter()
+    try:
+        stats = convert(args.input, output, args.format, args.encoding, args.workers,
+                        args.chunk_size, args.skip_header)
+    except (OSError, csv.Error) as e:
+        print(f"Error converting deck: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Read {stats['rows']} rows, wrote {stats['written']} pairs to {output} "
+          f"({stats['invalid']} invalid, {stats['duplicates']} duplicates) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
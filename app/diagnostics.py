@@ -0,0 +1,59 @@
+import gc
+import os
+import tracemalloc
+
+# Number of allocation sites listed for each transition that grew memory
+TOP_ALLOCATIONS = 5
+
+class LeakMonitor:
+    def __init__(self, root, top=TOP_ALLOCATIONS):
+        self.root = root
+        self.top = top
+        self.transitions = 0
+        self._snapshot = None
+        self._widgets = 0
+        self._traced = 0
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def count_widgets(self):
+        """Count every live Tk widget below the root window"""
+        count = 0
+        pending = list(self.root.winfo_children())
+        while pending:
+            widget = pending.pop()
+            count += 1
+            pending.extend(widget.winfo_children())
+        return count
+
+    def snapshot(self, leaving, entering):
+        """Compare memory and widget counts with the previous screen change and report growth"""
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        widgets = self.count_widgets()
+        traced, _ = tracemalloc.get_traced_memory()
+        pending_afters = len(self.root.tk.splitlist(self.root.tk.call("after", "info")))
+
+        self.transitions += 1
+        print(f"[diagnostics] #{self.transitions} {leaving} -> {entering}: "
+              f"{widgets} widgets ({widgets - self._widgets:+d}), "
+              f"{pending_afters} pending after() callbacks, "
+              f"{traced / 1024:.0f} KiB traced ({(traced - self._traced) / 1024:+.1f} KiB)")
+
+        if self._snapshot is not None and traced > self._traced:
+            for stat in snapshot.compare_to(self._snapshot, "lineno")[:self.top]:
+                if stat.size_diff > 0:
+                    print(f"[diagnostics]     {stat}")
+
+        self._snapshot = snapshot
+        self._widgets = widgets
+        self._traced = traced
+
+def leak_monitor_from_env(root):
+    """Create a LeakMonitor when MEMO_DIAGNOSTICS is set"""
+    if not os.environ.get("MEMO_DIAGNOSTICS"):
+        return None
+    return LeakMonitor(root)
@@ -1,100 +1,152 @@
 import tkinter as tk
-import tkinter.font as tkFont
 from tkinter import filedialog, messagebox, ttk
+from app.baseline import expected_moves
+from app.checkpoint import GameCheckpoint
+from app.confusion import card_ids, deck_id
+from app.diagnostics import leak_monitor_from_env
 from app.game_logic import MemoryGameLogic
-from app.leaderboard import LeaderboardManager
+from app.images import is_image_path
+from app.layout import compute_layout
+from app.metrics import timed, timer
+from app.network import DEFAULT_PORT, MAX_SEATS, MIN_SEATS, ClientThread, GameClient, HostThread
+from app.seats import SharedResources
 import time
 import json
 import os
+import queue
 
-# Predefined templates
-TEMPLATES = {
-    "Custom": [],
-    "Numbers 4x4": [(str(i), str(i)) for i in range(1, 9)],
-    "English Words A1": [
-        ("hello", "ciao"),
-        ("goodbye", "arrivederci"),
-        ("thank you", "grazie"),
-        ("yes", "sì"),
-        ("no", "no"),
-        ("book", "libro"),
-        ("car", "macchina"),
-        ("house", "casa")
-    ],
-    "Italian Food": [
-        ("pizza", "pizza"),
-        ("pasta", "pasta"),
-        ("gelato", "ice cream"),
-        ("espresso", "espresso"),
-        ("mozzarella", "mozzarella"),
-        ("bruschetta", "bruschetta"),
-        ("lasagna", "lasagna"),
-        ("carbonara", "carbonara")
-    ],
-    "World Capitals": [
-        ("France", "Paris"),
-        ("Italy", "Rome"),
-        ("Germany", "Berlin"),
-        ("Spain", "Madrid"),
-        ("Japan", "Tokyo"),
-        ("Brazil", "Brasília"),
-        ("Canada", "Ottawa"),
-        ("Australia", "Canberra")
-    ]
-}
+# Default card size in pixels (before the first layout) and text padding
+CARD_WIDTH = 140
+CARD_HEIGHT = 64
+CARD_PADDING = 8
+# Picture sizes follow the card size in steps, so small resizes reuse decodes
+IMAGE_BOX_STEP = 16
+
+# Resize events are coalesced into at most one board layout per frame
+LAYOUT_DEBOUNCE_MS = 16
+
+# How often the Tk loop picks up deltas from the network thread
+NETWORK_POLL_MS = 30
 
 class MemoryGameGUI:
-    def __init__(self):
-        self.window = tk.Tk()
-        self.window.title("Memo Trainer - Enhanced")
+    def __init__(self, shared=None, seat=None):
+        # Seats hosted in one process share fonts, caches, leaderboard and clock
+        self.shared = shared or SharedResources()
+        self.seat = seat
+        if shared is None:
+            self.window = self.shared.root
+        else:
+            self.window = tk.Toplevel(self.shared.root)
+        title = "Memo Trainer - Enhanced"
+        self.window.title(title if seat is None else f"{title} - Seat {seat}")
         self.window.configure(bg="#f0f4f8")
         self.window.geometry("800x600")
         self.window.resizable(True, True)
-
-        # Improved font configuration
-        default_font = tkFont.nametofont("TkDefaultFont")
-        default_font.configure(family="Segoe UI", size=11)
-        self.window.option_add("*Font", default_font)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.shared.attach(self)
+
+        self.fonts = self.shared.fonts
+        self.card_fitter = self.shared.card_fitter
+        self.card_pixel = self.shared.card_pixel
+        self.images = self.shared.images
+        self.clock = self.shared.clock
+        self.card_images = {}
+        self.picture_faces = {}
+        self.pending_faces = {}
+        self.board_pictures = []
 
         # Game state
         self.logic = None
+        self.current_pairs = []
+        self.next_logic = None
         self.buttons = {}
         self.first_choice = None
         self.timer_label = None
         self.start_time = None
         self.timer_running = False
-        self.after_id = None
         self.waiting = False
         self.current_difficulty = "Easy"
         self.moves_count = 0
         self.moves_label = None
 
+        self.expected_moves = 0
+        self.board_keys = []
+        self.board_size = None
+        self.board_layout = None
+        self.board_canvas = None
+        self.board_scrollbar = None
+        self.board_window = None
+        self.layout_after_id = None
+        self.pending_afters = set()
+
+        # Widgets owned by the current screen, released by _clear_window
+        self.current_screen = None
+        self.name_frame = None
+        self.name_entry = None
+        self.name_suggestions = None
+        self.scrollable_frame = None
+        self.form_frame = None
+        self.leaderboard_frame = None
+        self.network_status_label = None
+        self.network_scores_label = None
+
         # User data
         self.entries = []
         self.selected_template = tk.StringVar(value="Custom")
         self.username_var = tk.StringVar(value="Guest")
         self.is_guest_mode = tk.BooleanVar(value=True)
+
+        # Multiplayer state
+        self.network = None
+        self.network_host = None
+        self.network_poll_id = None
+        self.network_hides = {}
+        self.network_players = []
+        self.network_scores = []
+        self.network_turn = None
+        self.network_index = None
+        self.network_address_var = tk.StringVar(value="127.0.0.1")
+        self.network_port_var = tk.StringVar(value=str(DEFAULT_PORT))
+        self.network_room_var = tk.StringVar(value="classroom")
+        self.network_seats_var = tk.StringVar(value=str(MIN_SEATS))
+        self.network_hosting_var = tk.BooleanVar(value=True)
         
-        # Leaderboard manager
-        self.leaderboard = LeaderboardManager()
+        # Opt-in instrumentation (MEMO_METRICS_FILE / MEMO_METRICS_PORT / MEMO_DIAGNOSTICS)
+        self.metrics = self.shared.metrics
+        self.diagnostics = leak_monitor_from_env(self.window)
+
+        self.leaderboard = self.shared.leaderboard
+        self.players = self.shared.players
+        self.templates = self.shared.templates
+
+        # Mismatches are counted per deck and written once the game ends
+        self.confusion = self.shared.confusion
+        self.deck = None
+        self.card_ids = {}
+        self.player_id = None
+
+        # In-progress games survive crashes as a base snapshot plus a move journal
+        self.checkpoint = GameCheckpoint("checkpoint" if seat is None else f"checkpoint_seat{seat}")
         
         self._show_main_menu()
+        self.window.after_idle(self._offer_resume)
 
+    @timed("show_main_menu")
     def _show_main_menu(self):
         """Show the main menu with options"""
-        self._clear_window()
+        self._clear_window("main_menu")
         
         # Title
         title_frame = tk.Frame(self.window, bg="#f0f4f8")
         title_frame.pack(pady=30)
         
         title = tk.Label(title_frame, text="🎓 Memo Trainer", 
-                        font=("Segoe UI", 24, "bold"),
+                        font=self.fonts.get(24, "bold"),
                         bg="#f0f4f8", fg="#2c3e50")
         title.pack()
         
         subtitle = tk.Label(title_frame, text="Train Your Memory with Custom Content",
-                           font=("Segoe UI", 14), bg="#f0f4f8", fg="#7f8c8d")
+                           font=self.fonts.get(14), bg="#f0f4f8", fg="#7f8c8d")
         subtitle.pack(pady=(5, 0))
 
         # Menu buttons
@@ -103,6 +155,7 @@ class MemoryGameGUI:
 
         buttons_data = [
             ("🎮 Play Game", self._show_input_screen, "#3498db"),
+            ("🌐 Multiplayer", self._show_network_setup, "#16a085"),
             ("🏆 View Leaderboard", self._show_leaderboard, "#e74c3c"),
             ("📊 Statistics", self._show_statistics, "#f39c12"),
             ("❓ How to Play", self._show_help, "#9b59b6"),
@@ -110,7 +163,7 @@ class MemoryGameGUI:
 
         for text, command, color in buttons_data:
             btn = tk.Button(menu_frame, text=text, command=command,
-                           font=("Segoe UI", 14, "bold"), bg=color, fg="white",
+                           font=self.fonts.get(14, "bold"), bg=color, fg="white",
                            width=20, height=2, relief="flat", cursor="hand2")
             btn.pack(pady=8)
             
@@ -130,24 +183,25 @@ class MemoryGameGUI:
         darkened = tuple(max(0, int(c * 0.8)) for c in rgb)
         return f"#{darkened[0]:02x}{darkened[1]:02x}{darkened[2]:02x}"
 
+    @timed("show_input_screen")
     def _show_input_screen(self):
         """Show the game setup screen"""
-        self._clear_window()
+        self._clear_window("input_screen")
 
         # Back button
         back_btn = tk.Button(self.window, text="← Back to Menu", command=self._show_main_menu,
-                            font=("Segoe UI", 10), bg="#95a5a6", fg="white")
+                            font=self.fonts.get(10), bg="#95a5a6", fg="white")
         back_btn.pack(anchor="nw", padx=10, pady=5)
 
         # Title
         title = tk.Label(self.window, text="🎓 Setup Your Memory Game", 
-                        font=("Segoe UI", 18, "bold"),
+                        font=self.fonts.get(18, "bold"),
                         bg="#f0f4f8", fg="#2c3e50")
         title.pack(pady=15)
 
         # Player settings frame
         player_frame = tk.LabelFrame(self.window, text="Player Settings", 
-                                   font=("Segoe UI", 12, "bold"),
+                                   font=self.fonts.get(12, "bold"),
                                    bg="#f0f4f8", fg="#2c3e50", padx=10, pady=10)
         player_frame.pack(pady=10, padx=20, fill="x")
 
@@ -158,47 +212,51 @@ class MemoryGameGUI:
         tk.Radiobutton(mode_frame, text="Play as Guest (no score saving)", 
                       variable=self.is_guest_mode, value=True,
                       command=self._toggle_guest_mode,
-                      font=("Segoe UI", 11), bg="#f0f4f8").pack(anchor="w")
+                      font=self.fonts.get(11), bg="#f0f4f8").pack(anchor="w")
 
         tk.Radiobutton(mode_frame, text="Play with registered name", 
                       variable=self.is_guest_mode, value=False,
                       command=self._toggle_guest_mode,
-                      font=("Segoe UI", 11), bg="#f0f4f8").pack(anchor="w")
+                      font=self.fonts.get(11), bg="#f0f4f8").pack(anchor="w")
 
         # Name entry
         self.name_frame = tk.Frame(player_frame, bg="#f0f4f8")
         self.name_frame.pack(fill="x", pady=5)
         
         tk.Label(self.name_frame, text="Player Name:", bg="#f0f4f8", 
-                font=("Segoe UI", 11)).pack(side=tk.LEFT)
+                font=self.fonts.get(11)).pack(side=tk.LEFT)
         self.name_entry = tk.Entry(self.name_frame, textvariable=self.username_var, 
-                                  width=25, font=("Segoe UI", 11))
+                                  width=25, font=self.fonts.get(11))
         self.name_entry.pack(side=tk.LEFT, padx=10)
+        self.name_entry.bind("<KeyRelease>", self._update_name_suggestions)
+        self.name_entry.bind("<Down>", self._focus_name_suggestions)
+        self.name_entry.bind("<Escape>", lambda e: self._hide_name_suggestions())
+        self.name_entry.bind("<FocusOut>", lambda e: self.window.after(150, self._hide_name_suggestions))
 
         # Template selection frame
         template_frame = tk.LabelFrame(self.window, text="Content Selection", 
-                                     font=("Segoe UI", 12, "bold"),
+                                     font=self.fonts.get(12, "bold"),
                                      bg="#f0f4f8", fg="#2c3e50", padx=10, pady=10)
         template_frame.pack(pady=10, padx=20, fill="x")
 
         dropdown_frame = tk.Frame(template_frame, bg="#f0f4f8")
         dropdown_frame.pack(fill="x", pady=5)
 
-        tk.Label(dropdown_frame, text="Select Template:", font=("Segoe UI", 11), 
+        tk.Label(dropdown_frame, text="Select Template:", font=self.fonts.get(11), 
                 bg="#f0f4f8").pack(side=tk.LEFT)
         
         style = ttk.Style()
         style.configure("Custom.TCombobox", fieldbackground="white")
         
         dropdown = ttk.Combobox(dropdown_frame, textvariable=self.selected_template,
-                               values=list(TEMPLATES.keys()), state="readonly",
+                               values=["Custom"] + self.templates.names(), state="readonly",
                                width=25, style="Custom.TCombobox")
         dropdown.pack(side=tk.LEFT, padx=10)
         dropdown.bind("<<ComboboxSelected>>", lambda e: self._load_template(self.selected_template.get()))
 
         # Pairs input frame
         pairs_frame = tk.LabelFrame(self.window, text="Memory Pairs", 
-                                  font=("Segoe UI", 12, "bold"),
+                                  font=self.fonts.get(12, "bold"),
                                   bg="#f0f4f8", fg="#2c3e50", padx=10, pady=10)
         pairs_frame.pack(pady=10, padx=20, fill="both", expand=True)
 
@@ -232,13 +290,13 @@ class MemoryGameGUI:
 
         for text, command, color in buttons_data:
             btn = tk.Button(control_frame, text=text, command=command,
-                           font=("Segoe UI", 10), bg=color, fg="white", relief="flat")
+                           font=self.fonts.get(10), bg=color, fg="white", relief="flat")
             btn.pack(side=tk.LEFT, padx=5)
 
         # Start game button
         start_btn = tk.Button(self.window, text="▶ Start Memory Game", 
                              command=self._start_game,
-                             font=("Segoe UI", 16, "bold"), bg="#e74c3c", fg="white", 
+                             font=self.fonts.get(16, "bold"), bg="#e74c3c", fg="white", 
                              height=2, relief="flat", cursor="hand2")
         start_btn.pack(pady=20)
 
@@ -250,6 +308,48 @@ class MemoryGameGUI:
         self._toggle_guest_mode()
         self._load_template(self.selected_template.get())
 
+    def _update_name_suggestions(self, event=None):
+        """Show registered names matching what has been typed so far"""
+        if event is not None and event.keysym in ("Down", "Up", "Return", "Escape", "Tab"):
+            return
+        typed = self.username_var.get()
+        matches = [name for name in self.players.complete(typed) if name != typed.strip()]
+        if not matches:
+            self._hide_name_suggestions()
+            return
+
+        if self.name_suggestions is None:
+            self.name_suggestions = tk.Listbox(self.window, font=self.fonts.get(11),
+                                               activestyle="none", exportselection=False)
+            self.name_suggestions.bind("<<ListboxSelect>>", self._choose_name_suggestion)
+            self.name_suggestions.bind("<Return>", self._choose_name_suggestion)
+            self.name_suggestions.bind("<Escape>", lambda e: self._hide_name_suggestions())
+
+        self.name_suggestions.delete(0, tk.END)
+        self.name_suggestions.insert(tk.END, *matches)
+        self.name_suggestions.config(height=len(matches))
+        self.name_suggestions.place(in_=self.name_entry, x=0, rely=1.0, relwidth=1.0)
+        self.name_suggestions.lift()
+
+    def _focus_name_suggestions(self, event=None):
+        if self.name_suggestions is not None and self.name_suggestions.winfo_ismapped():
+            self.name_suggestions.focus_set()
+            self.name_suggestions.selection_set(0)
+            self.name_suggestions.activate(0)
+
+    def _choose_name_suggestion(self, event=None):
+        """Fill the name field with the highlighted suggestion"""
+        selection = self.name_suggestions.curselection()
+        if selection:
+            self.username_var.set(self.name_suggestions.get(selection[0]))
+            self.name_entry.icursor(tk.END)
+        self._hide_name_suggestions()
+        self.name_entry.focus_set()
+
+    def _hide_name_suggestions(self):
+        if self.name_suggestions is not None:
+            self.name_suggestions.place_forget()
+
     def _toggle_guest_mode(self):
         """Toggle between guest and registered player mode"""
         if self.is_guest_mode.get():
@@ -269,7 +369,7 @@ class MemoryGameGUI:
         self.entries.clear()
 
         # Load template data
-        template_pairs = TEMPLATES.get(template_name, [])
+        template_pairs = self.templates.get(template_name)
         if template_pairs:
             for key, value in template_pairs:
                 self._add_pair_fields(key, value)
@@ -283,17 +383,17 @@ class MemoryGameGUI:
         pair_frame = tk.Frame(self.form_frame, bg="#f0f4f8")
         pair_frame.pack(fill="x", pady=3)
 
-        term_entry = tk.Entry(pair_frame, width=25, font=("Segoe UI", 10))
-        arrow_label = tk.Label(pair_frame, text="↔", font=("Segoe UI", 12), 
+        term_entry = tk.Entry(pair_frame, width=25, font=self.fonts.get(10))
+        arrow_label = tk.Label(pair_frame, text="↔", font=self.fonts.get(12), 
                               bg="#f0f4f8", fg="#7f8c8d")
-        def_entry = tk.Entry(pair_frame, width=25, font=("Segoe UI", 10))
+        def_entry = tk.Entry(pair_frame, width=25, font=self.fonts.get(10))
         
         term_entry.insert(0, key)
         def_entry.insert(0, value)
 
         remove_btn = tk.Button(pair_frame, text="🗑", 
                               command=lambda: self._remove_pair(pair_frame, term_entry, def_entry),
-                              font=("Segoe UI", 10), fg="#e74c3c", bg="#fff2f2", 
+                              font=self.fonts.get(10), fg="#e74c3c", bg="#fff2f2", 
                               relief="flat", width=3, cursor="hand2")
 
         term_entry.pack(side=tk.LEFT, padx=5)
@@ -306,7 +406,7 @@ class MemoryGameGUI:
     def _remove_pair(self, frame, term_entry, def_entry):
         """Remove a pair from the list"""
         if len(self.entries) <= 2:
-            messagebox.showwarning("Warning", "You need at least 2 pairs to play!")
+            messagebox.showwarning("Warning", "You need at least 2 pairs to play!", parent=self.window)
             return
 
         try:
@@ -329,20 +429,27 @@ class MemoryGameGUI:
                 pairs.append((term, definition))
 
         if len(pairs) < 2:
-            messagebox.showwarning("Error", "Please enter at least 2 valid pairs.")
+            messagebox.showwarning("Error", "Please enter at least 2 valid pairs.", parent=self.window)
             return
 
         # Validate player name for non-guest mode
         if not self.is_guest_mode.get():
             name = self.username_var.get().strip()
             if not name or name == "Guest":
-                messagebox.showwarning("Error", "Please enter a valid player name.")
+                messagebox.showwarning("Error", "Please enter a valid player name.", parent=self.window)
                 return
 
         # Initialize game
         self.logic = MemoryGameLogic(pairs)
+        self.current_pairs = pairs
+        self.expected_moves = expected_moves(len(self.logic.pairs))
+        self._track_confusions(pairs)
+        self.next_logic = None
         self.first_choice = None
         self.buttons = {}
+        self.card_images = {}
+        self.picture_faces = {}
+        self.pending_faces = {}
         self.moves_count = 0
         
         # Determine difficulty based on number of pairs
@@ -355,10 +462,79 @@ class MemoryGameGUI:
             self.current_difficulty = "Hard"
 
         self._show_game_screen()
+        self._prefetch_images(pairs)
+        self._checkpoint_game()
+
+    def _track_confusions(self, pairs):
+        """Identify the deck and its cards for the confusion counters"""
+        self.deck = deck_id(pairs)
+        self.card_ids = card_ids(pairs)
+
+    def _flush_confusions(self):
+        if self.deck:
+            self.confusion.flush(self.deck, self.current_pairs)
+
+    def _prefetch_images(self, pairs):
+        """Decode picture cards ahead of time so flipping never waits on disk"""
+        self.board_pictures = [value for pair in pairs for value in pair if is_image_path(value)]
+        # New boards prefetch once their card size is known, in _apply_layout
+        if self.board_pictures and self.board_layout is not None:
+            self.images.prefetch(self.board_pictures, self._card_image_box(), self._on_image_ready)
+
+    def _checkpoint_game(self):
+        """Write the base snapshot that per-move journal records build on"""
+        self.checkpoint.start({
+            'pairs': self.current_pairs,
+            'blocks': [self.logic.blocks[f"block_{i}"] for i in range(len(self.logic.blocks))],
+            'difficulty': self.current_difficulty,
+            'expected_moves': self.expected_moves,
+            'guest': self.is_guest_mode.get(),
+            'player': self.username_var.get(),
+        })
+
+    def _offer_resume(self):
+        """Ask to continue a game that was interrupted by a crash or forced exit"""
+        state = self.checkpoint.load()
+        if state is None:
+            return
+        if messagebox.askyesno("Resume Game", "An unfinished game was found.\n"
+                               "Do you want to continue where you left off?", parent=self.window):
+            self._resume_game(state)
+        else:
+            self.checkpoint.clear()
+
+    def _resume_game(self, state):
+        """Rebuild the board, matched cards, moves and time from a checkpoint"""
+        pairs = [tuple(pair) for pair in state['pairs']]
+        self.logic = MemoryGameLogic.from_blocks(pairs, state['blocks'])
+        self.current_pairs = pairs
+        self.next_logic = None
+        self.expected_moves = state['expected_moves']
+        self._track_confusions(pairs)
+        self.current_difficulty = state['difficulty']
+        self.is_guest_mode.set(state['guest'])
+        self.username_var.set(state['player'])
 
+        self._show_game_screen()
+        self._prefetch_images(pairs)
+
+        for index in state['matched']:
+            key = f"block_{index}"
+            self._reveal_card(key, state['blocks'][index])
+            self.buttons[key].config(bg="#27ae60", fg="white")
+            self.logic.blocks.pop(key, None)
+
+        self.moves_count = state['moves']
+        self.moves_label.config(text=f"Moves: {self.moves_count}")
+        self.start_time = time.time() - state['elapsed']
+        self.checkpoint.resume(state['journal_size'])
+        if self.logic.has_won():
+            self._game_won()
+
+    @timed("show_game_screen")
     def _show_game_screen(self):
         """Display the game interface"""
-        self._clear_window()
+        self._clear_window("game_screen")
 
         # Game info header
         info_frame = tk.Frame(self.window, bg="#34495e", height=80)
@@ -368,7 +544,7 @@ class MemoryGameGUI:
         # Player info
         player_info = f"Player: {self.username_var.get()}" if not self.is_guest_mode.get() else "Guest Mode"
         player_label = tk.Label(info_frame, text=player_info, 
-                               font=("Segoe UI", 12, "bold"), bg="#34495e", fg="white")
+                               font=self.fonts.get(12, "bold"), bg="#34495e", fg="white")
         player_label.pack(side="left", padx=20, pady=10)
 
         # Timer and moves
@@ -376,15 +552,15 @@ class MemoryGameGUI:
         stats_frame.pack(side="right", padx=20, pady=10)
 
         self.timer_label = tk.Label(stats_frame, text="Time: 0s", 
-                                   font=("Segoe UI", 12, "bold"), bg="#34495e", fg="#3498db")
+                                   font=self.fonts.get(12, "bold"), bg="#34495e", fg="#3498db")
         self.timer_label.pack()
 
         self.moves_label = tk.Label(stats_frame, text="Moves: 0", 
-                                   font=("Segoe UI", 12, "bold"), bg="#34495e", fg="#e74c3c")
+                                   font=self.fonts.get(12, "bold"), bg="#34495e", fg="#e74c3c")
         self.moves_label.pack()
 
         difficulty_label = tk.Label(stats_frame, text=f"Difficulty: {self.current_difficulty}", 
-                                   font=("Segoe UI", 10), bg="#34495e", fg="#f39c12")
+                                   font=self.fonts.get(10), bg="#34495e", fg="#f39c12")
         difficulty_label.pack()
 
         # Game grid
@@ -396,12 +572,12 @@ class MemoryGameGUI:
 
         reset_btn = tk.Button(control_frame, text="🔄 New Game", 
                              command=self._show_input_screen,
-                             font=("Segoe UI", 12, "bold"), bg="#95a5a6", fg="white")
+                             font=self.fonts.get(12, "bold"), bg="#95a5a6", fg="white")
         reset_btn.pack(side="left", padx=10)
 
         menu_btn = tk.Button(control_frame, text="🏠 Main Menu", 
                             command=self._show_main_menu,
-                            font=("Segoe UI", 12, "bold"), bg="#34495e", fg="white")
+                            font=self.fonts.get(12, "bold"), bg="#34495e", fg="white")
         menu_btn.pack(side="left", padx=10)
 
         # Start timer
@@ -409,36 +585,93 @@ class MemoryGameGUI:
         self.timer_running = True
         self._start_timer()
 
-    def _create_grid(self):
+    @timed("create_grid")
+    def _create_grid(self, keys=None, on_click=None):
         """Create the game grid with cards"""
         game_frame = tk.Frame(self.window, bg="#f0f4f8")
         game_frame.pack(expand=True, fill="both", padx=20, pady=10)
 
-        keys = list(self.logic.blocks.keys())
-        num_cards = len(keys)
-        
-        # Determine grid layout
-        if num_cards <= 8:
-            cols = 4
-        elif num_cards <= 16:
-            cols = 4
-        else:
-            cols = 6
-
-        for i, key in enumerate(keys):
-            row, col = i // cols, i % cols
-            
-            btn = tk.Button(game_frame, text="?", font=("Segoe UI", 12, "bold"),
-                           width=15, height=3, wraplength=120,
+        # Cards sit on a canvas so a board too small for them scrolls instead of clipping
+        self.board_canvas = tk.Canvas(game_frame, bg="#f0f4f8", highlightthickness=0)
+        self.board_scrollbar = tk.Scrollbar(game_frame, orient="vertical",
+                                            command=self.board_canvas.yview)
+        self.board_canvas.configure(yscrollcommand=self.board_scrollbar.set)
+        self.board_canvas.pack(side="left", expand=True, fill="both")
+        board = tk.Frame(self.board_canvas, bg="#f0f4f8")
+        self.board_window = self.board_canvas.create_window((0, 0), window=board, anchor="nw")
+
+        if keys is None:
+            keys = list(self.logic.blocks.keys())
+        on_click = on_click or self._on_click
+        self.board_keys = keys
+        self.board_size = None
+        self.board_layout = None
+
+        for key in keys:
+            # A 1x1 image with compound="center" makes width/height pixel based
+            btn = tk.Button(board, text="?", font=self.fonts.get(12, "bold"),
+                           image=self.card_pixel, compound="center",
+                           width=CARD_WIDTH, height=CARD_HEIGHT,
                            bg="#ecf0f1", fg="#2c3e50", relief="raised", bd=2,
-                           cursor="hand2", command=lambda k=key: self._on_click(k))
-            
-            btn.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+                           cursor="hand2", command=lambda k=key: on_click(k))
             self.buttons[key] = btn
 
-        # Configure grid weights for responsiveness
-        for i in range(cols):
-            game_frame.columnconfigure(i, weight=1)
+        # Cards are placed by _apply_layout whenever the board changes size
+        self.board_canvas.bind("<Configure>", self._schedule_layout)
+
+    def _schedule_layout(self, event):
+        """Coalesce resize events into one layout pass per frame"""
+        self.board_size = (event.width, event.height)
+        if self.layout_after_id is None:
+            self.layout_after_id = self._after(LAYOUT_DEBOUNCE_MS, self._apply_layout)
+
+    def _apply_layout(self):
+        """Move and resize the existing cards to fit the board"""
+        self.layout_after_id = None
+        width, height = self.board_size
+        layout = compute_layout(width, height, len(self.board_keys))
+
+        grid_height = max(height, layout.height)
+        self.board_canvas.itemconfigure(self.board_window, width=width, height=grid_height)
+        self.board_canvas.configure(scrollregion=(0, 0, width, grid_height))
+        if layout.height > height:
+            self.board_scrollbar.pack(side="right", fill="y")
+        else:
+            self.board_scrollbar.pack_forget()
+        if layout == self.board_layout:
+            return
+
+        resized = self.board_layout is None or (layout.card_width, layout.card_height) != (
+            self.board_layout.card_width, self.board_layout.card_height)
+        self.board_layout = layout
+        for i, key in enumerate(self.board_keys):
+            x, y = layout.position(i)
+            btn = self.buttons[key]
+            btn.place(x=x, y=y, width=layout.card_width, height=layout.card_height)
+
+            # Revealed cards get a font or picture for the new card size
+            text = btn.cget("text")
+            if resized and key in self.picture_faces:
+                self._show_picture(key, self.picture_faces[key])
+            elif resized and text not in ("?", ""):
+                font, wraplength = self.card_fitter.fit(text, *self._card_text_box())
+                btn.config(font=font, wraplength=wraplength)
+
+        if resized and self.board_pictures:
+            self.images.prefetch(self.board_pictures, self._card_image_box(), self._on_image_ready)
+
+    def _card_text_box(self):
+        """Pixel area available for text on a card at the current layout"""
+        if self.board_layout is None:
+            return CARD_WIDTH - CARD_PADDING, CARD_HEIGHT - CARD_PADDING
+        return (self.board_layout.card_width - CARD_PADDING,
+                self.board_layout.card_height - CARD_PADDING)
+
+    def _card_image_box(self):
+        """Bounding box pictures are decoded to, rounded down to IMAGE_BOX_STEP"""
+        width, height = self._card_text_box()
+        return (max(IMAGE_BOX_STEP, width - width % IMAGE_BOX_STEP),
+                max(IMAGE_BOX_STEP, height - height % IMAGE_BOX_STEP))
 
     def _on_click(self, key):
         """Handle card click"""
@@ -448,9 +681,13 @@ class MemoryGameGUI:
         if self.first_choice == key:
             return
 
+        if self.metrics:
+            clicked = time.perf_counter()
+            self.window.after_idle(lambda: self.metrics.observe(
+                "memo_click_to_idle_ms", (time.perf_counter() - clicked) * 1000))
+
         value = self.logic.get_value(key)
-        self.buttons[key].config(text=value, state="disabled", 
-                                bg="#3498db", fg="white", relief="flat")
+        self._reveal_card(key, value)
 
         if not self.first_choice:
             self.first_choice = key
@@ -461,8 +698,11 @@ class MemoryGameGUI:
 
             val1 = self.logic.get_value(self.first_choice)
             val2 = self.logic.get_value(second_choice)
+            matched = self.logic.check_match(val1, val2)
+            self.checkpoint.record_move(self.first_choice.split("_")[1], second_choice.split("_")[1],
+                                        matched, self.moves_count, int(time.time() - self.start_time))
 
-            if self.logic.check_match(val1, val2):
+            if matched:
                 # Match found
                 self.logic.remove_blocks(self.first_choice, second_choice)
                 self.buttons[self.first_choice].config(bg="#27ae60", fg="white")
@@ -473,34 +713,90 @@ class MemoryGameGUI:
                     self._game_won()
             else:
                 # No match
+                self.confusion.record(self.deck, self.card_ids[val1], self.card_ids[val2])
                 self.waiting = True
                 first = self.first_choice
                 self.first_choice = None
 
                 def reset():
-                    if first in self.buttons:
-                        self.buttons[first].config(text="?", state="normal", 
-                                                  bg="#ecf0f1", fg="#2c3e50", relief="raised")
-                    if second_choice in self.buttons:
-                        self.buttons[second_choice].config(text="?", state="normal", 
-                                                          bg="#ecf0f1", fg="#2c3e50", relief="raised")
+                    for choice in (first, second_choice):
+                        if choice in self.buttons:
+                            self._hide_card(choice)
                     self.waiting = False
 
-                self.window.after(1200, reset)
+                self._after(1200, reset)
+
+    def _reveal_card(self, key, value):
+        """Show a card's face: a cached picture or fitted text"""
+        btn = self.buttons[key]
+        if is_image_path(value):
+            self._show_picture(key, value)
+        else:
+            font, wraplength = self.card_fitter.fit(value, *self._card_text_box())
+            btn.config(text=value, font=font, wraplength=wraplength)
+        btn.config(state="disabled", bg="#3498db", fg="white", relief="flat")
+
+    def _show_picture(self, key, path):
+        """Show a picture sized for the current cards, decoding it if it is not cached"""
+        self.picture_faces[key] = path
+        image = self.images.get(path, self._card_image_box())
+        if image is not None:
+            self.pending_faces.pop(key, None)
+            self.card_images[key] = image
+            self.buttons[key].config(image=image, text="")
+            return
+
+        self.pending_faces[key] = path
+        # Decodes already in flight are not started twice
+        self.images.prefetch([path], self._card_image_box(), self._on_image_ready)
+        if key not in self.card_images:
+            # Until _on_image_ready, show the file name (or keep the old-size picture)
+            text = os.path.basename(path)
+            font, wraplength = self.card_fitter.fit(text, *self._card_text_box())
+            self.buttons[key].config(text=text, font=font, wraplength=wraplength)
+
+    def _hide_card(self, key):
+        """Turn a card face down again"""
+        self.card_images.pop(key, None)
+        self.picture_faces.pop(key, None)
+        self.pending_faces.pop(key, None)
+        self.buttons[key].config(text="?", image=self.card_pixel, font=self.fonts.get(12, "bold"),
+                                 state="normal", bg="#ecf0f1", fg="#2c3e50", relief="raised")
+
+    def _on_image_ready(self, path):
+        """Swap a finished picture onto any revealed card still showing its file name"""
+        image = self.images.get(path, self._card_image_box())
+        if image is None:
+            # Finished for an earlier card size; the current size is still pending
+            return
+        for key, pending_path in list(self.pending_faces.items()):
+            if pending_path == path and key in self.buttons:
+                del self.pending_faces[key]
+                self.card_images[key] = image
+                try:
+                    self.buttons[key].config(image=image, text="")
+                except tk.TclError:
+                    pass
 
     def _game_won(self):
         """Handle game completion"""
         self.timer_running = False
         elapsed_time = int(time.time() - self.start_time)
+        self.checkpoint.clear()
+        self._flush_confusions()
         
         # Calculate score
         score = self._calculate_score(elapsed_time, self.moves_count)
         
         # Save score if not guest
         if not self.is_guest_mode.get():
-            player_name = self.username_var.get().strip()
-            self.leaderboard.add_score(player_name, score, elapsed_time, 
-                                     self.moves_count, self.current_difficulty)
+            # Names differing only in case or spacing map to one registered player
+            self.player_id = self.players.register(self.username_var.get().strip())
+            player_name = self.players.name(self.player_id)
+            with timer(self.metrics, "memo_leaderboard_io_ms", op="add_score"):
+                self.leaderboard.add_score(player_name, score, elapsed_time, 
+                                         self.moves_count, self.current_difficulty,
+                                         player_id=self.player_id)
 
         # Show win dialog
         self._show_win_dialog(elapsed_time, score)
@@ -516,18 +812,18 @@ class MemoryGameGUI:
         # Time penalty (lose points for every second over 30)
         time_penalty = max(0, time_taken - 30) * 2
         
-        # Move penalty (lose points for extra moves)
-        expected_moves = len(self.entries)
-        move_penalty = max(0, moves - expected_moves) * 5
+        # Move penalty (lose points for moves beyond perfect-memory play)
+        move_penalty = max(0, moves - self.expected_moves) * 5
         
         final_score = max(50, int((base_score - time_penalty - move_penalty) * multiplier))
         return final_score
 
+    @timed("show_win_dialog")
     def _show_win_dialog(self, time_taken, score):
         """Show win dialog with results"""
         win_window = tk.Toplevel(self.window)
         win_window.title("Congratulations!")
-        win_window.geometry("400x300")
+        win_window.geometry("640x340")
         win_window.configure(bg="#f0f4f8")
         win_window.transient(self.window)
         win_window.grab_set()
@@ -536,9 +832,12 @@ class MemoryGameGUI:
         win_window.geometry("+%d+%d" % (self.window.winfo_rootx() + 50, 
                                        self.window.winfo_rooty() + 50))
 
+        # Shuffle the rematch while the player reads their results
+        self.window.after_idle(self._prepare_replay)
+
         # Congratulations message
         tk.Label(win_window, text="🎉 Congratulations! 🎉", 
-                font=("Segoe UI", 20, "bold"), bg="#f0f4f8", fg="#27ae60").pack(pady=20)
+                font=self.fonts.get(20, "bold"), bg="#f0f4f8", fg="#27ae60").pack(pady=20)
 
         # Results frame
         results_frame = tk.Frame(win_window, bg="#fff", relief="raised", bd=2)
@@ -551,44 +850,78 @@ class MemoryGameGUI:
             ("Score:", f"{score} points")
         ]
 
+        if not self.is_guest_mode.get():
+            best = self.leaderboard.get_player_best(None, self.current_difficulty,
+                                                    player_id=self.player_id)
+            results_data.append(("Personal Best:", f"{best['score']} points"))
+
         for label, value in results_data:
             row_frame = tk.Frame(results_frame, bg="#fff")
             row_frame.pack(fill="x", padx=20, pady=5)
             
-            tk.Label(row_frame, text=label, font=("Segoe UI", 12, "bold"), 
+            tk.Label(row_frame, text=label, font=self.fonts.get(12, "bold"), 
                     bg="#fff", fg="#2c3e50").pack(side="left")
-            tk.Label(row_frame, text=value, font=("Segoe UI", 12), 
+            tk.Label(row_frame, text=value, font=self.fonts.get(12), 
                     bg="#fff", fg="#7f8c8d").pack(side="right")
 
         if not self.is_guest_mode.get():
             tk.Label(win_window, text="Score saved to leaderboard!", 
-                    font=("Segoe UI", 11, "italic"), bg="#f0f4f8", fg="#27ae60").pack(pady=5)
+                    font=self.fonts.get(11, "italic"), bg="#f0f4f8", fg="#27ae60").pack(pady=5)
 
         # Buttons frame
         btn_frame = tk.Frame(win_window, bg="#f0f4f8")
         btn_frame.pack(pady=20)
 
+        tk.Button(btn_frame, text="⚡ Quick Replay", command=lambda: [win_window.destroy(), self._quick_replay()],
+                 font=self.fonts.get(12, "bold"), bg="#27ae60", fg="white").pack(side="left", padx=10)
+
         tk.Button(btn_frame, text="🎮 Play Again", command=lambda: [win_window.destroy(), self._show_input_screen()],
-                 font=("Segoe UI", 12, "bold"), bg="#3498db", fg="white").pack(side="left", padx=10)
+                 font=self.fonts.get(12, "bold"), bg="#3498db", fg="white").pack(side="left", padx=10)
 
         tk.Button(btn_frame, text="🏆 View Leaderboard", command=lambda: [win_window.destroy(), self._show_leaderboard()],
-                 font=("Segoe UI", 12, "bold"), bg="#e74c3c", fg="white").pack(side="left", padx=10)
+                 font=self.fonts.get(12, "bold"), bg="#e74c3c", fg="white").pack(side="left", padx=10)
 
         tk.Button(btn_frame, text="🏠 Main Menu", command=lambda: [win_window.destroy(), self._show_main_menu()],
-                 font=("Segoe UI", 12, "bold"), bg="#95a5a6", fg="white").pack(side="left", padx=10)
+                 font=self.fonts.get(12, "bold"), bg="#95a5a6", fg="white").pack(side="left", padx=10)
+
+    def _prepare_replay(self):
+        """Build the next shuffled game for the same set ahead of time"""
+        if self.current_pairs and self.next_logic is None:
+            self.next_logic = MemoryGameLogic(self.current_pairs)
+
+    @timed("quick_replay")
+    def _quick_replay(self):
+        """Restart with the same set by resetting the existing board in place"""
+        self._prepare_replay()
+        self.logic = self.next_logic
+        self.next_logic = None
+        self.first_choice = None
+        self.waiting = False
+        self.moves_count = 0
+
+        for key in self.buttons:
+            self._hide_card(key)
+        self.moves_label.config(text="Moves: 0")
+        self._checkpoint_game()
+        self.timer_label.config(text="Time: 0s")
+
+        self.start_time = time.time()
+        self.timer_running = True
+        self._start_timer()
 
+    @timed("show_leaderboard")
     def _show_leaderboard(self):
         """Display the leaderboard"""
-        self._clear_window()
+        self._clear_window("leaderboard")
 
         # Back button
         back_btn = tk.Button(self.window, text="← Back to Menu", command=self._show_main_menu,
-                            font=("Segoe UI", 10), bg="#95a5a6", fg="white")
+                            font=self.fonts.get(10), bg="#95a5a6", fg="white")
         back_btn.pack(anchor="nw", padx=10, pady=5)
 
         # Title
         title = tk.Label(self.window, text="🏆 Leaderboard", 
-                        font=("Segoe UI", 24, "bold"), bg="#f0f4f8", fg="#2c3e50")
+                        font=self.fonts.get(24, "bold"), bg="#f0f4f8", fg="#2c3e50")
         title.pack(pady=20)
 
         # Difficulty filter
@@ -596,7 +929,7 @@ class MemoryGameGUI:
         filter_frame.pack(pady=10)
 
         tk.Label(filter_frame, text="Filter by difficulty:", 
-                font=("Segoe UI", 12), bg="#f0f4f8").pack(side="left")
+                font=self.fonts.get(12), bg="#f0f4f8").pack(side="left")
 
         difficulty_var = tk.StringVar(value="All")
         difficulties = ["All", "Easy", "Medium", "Hard"]
@@ -604,7 +937,7 @@ class MemoryGameGUI:
         for diff in difficulties:
             tk.Radiobutton(filter_frame, text=diff, variable=difficulty_var, value=diff,
                           command=lambda: self._update_leaderboard_display(difficulty_var.get()),
-                          font=("Segoe UI", 11), bg="#f0f4f8").pack(side="left", padx=10)
+                          font=self.fonts.get(11), bg="#f0f4f8").pack(side="left", padx=10)
 
         # Leaderboard display
         self.leaderboard_frame = tk.Frame(self.window, bg="#f0f4f8")
@@ -618,11 +951,12 @@ class MemoryGameGUI:
         for widget in self.leaderboard_frame.winfo_children():
             widget.destroy()
 
-        scores = self.leaderboard.get_top_scores(difficulty_filter if difficulty_filter != "All" else None)
+        with timer(self.metrics, "memo_leaderboard_io_ms", op="get_top_scores"):
+            scores = self.leaderboard.get_top_scores(difficulty_filter if difficulty_filter != "All" else None)
 
         if not scores:
             tk.Label(self.leaderboard_frame, text="No scores recorded yet!", 
-                    font=("Segoe UI", 16), bg="#f0f4f8", fg="#7f8c8d").pack(pady=50)
+                    font=self.fonts.get(16), bg="#f0f4f8", fg="#7f8c8d").pack(pady=50)
             return
 
         # Header
@@ -633,7 +967,7 @@ class MemoryGameGUI:
         header_widths = [8, 20, 10, 10, 10, 12, 15]
 
         for i, (header, width) in enumerate(zip(headers, header_widths)):
-            tk.Label(header_frame, text=header, font=("Segoe UI", 12, "bold"),
+            tk.Label(header_frame, text=header, font=self.fonts.get(12, "bold"),
                     bg="#34495e", fg="white", width=width).grid(row=0, column=i, padx=2, pady=10)
 
         # Scores
@@ -659,28 +993,30 @@ class MemoryGameGUI:
             ]
 
             for i, (value, width) in enumerate(zip(values, header_widths)):
-                tk.Label(score_frame, text=value, font=("Segoe UI", 11),
+                tk.Label(score_frame, text=value, font=self.fonts.get(11),
                         bg=row_color, fg="#2c3e50", width=width).grid(row=0, column=i, padx=2, pady=5)
 
+    @timed("show_statistics")
     def _show_statistics(self):
         """Show player statistics"""
-        self._clear_window()
+        self._clear_window("statistics")
 
         # Back button
         back_btn = tk.Button(self.window, text="← Back to Menu", command=self._show_main_menu,
-                            font=("Segoe UI", 10), bg="#95a5a6", fg="white")
+                            font=self.fonts.get(10), bg="#95a5a6", fg="white")
         back_btn.pack(anchor="nw", padx=10, pady=5)
 
         # Title
         title = tk.Label(self.window, text="📊 Statistics", 
-                        font=("Segoe UI", 24, "bold"), bg="#f0f4f8", fg="#2c3e50")
+                        font=self.fonts.get(24, "bold"), bg="#f0f4f8", fg="#2c3e50")
         title.pack(pady=20)
 
-        stats = self.leaderboard.get_statistics()
+        with timer(self.metrics, "memo_leaderboard_io_ms", op="get_statistics"):
+            stats = self.leaderboard.get_statistics()
 
         if not stats:
             tk.Label(self.window, text="No game data available yet!", 
-                    font=("Segoe UI", 16), bg="#f0f4f8", fg="#7f8c8d").pack(pady=50)
+                    font=self.fonts.get(16), bg="#f0f4f8", fg="#7f8c8d").pack(pady=50)
             return
 
         # Statistics display
@@ -689,7 +1025,7 @@ class MemoryGameGUI:
 
         # General stats
         general_frame = tk.LabelFrame(stats_frame, text="General Statistics", 
-                                    font=("Segoe UI", 14, "bold"), bg="#f0f4f8", fg="#2c3e50")
+                                    font=self.fonts.get(14, "bold"), bg="#f0f4f8", fg="#2c3e50")
         general_frame.pack(fill="x", pady=10, padx=10, ipady=10)
 
         general_stats = [
@@ -704,48 +1040,62 @@ class MemoryGameGUI:
             row = i // 2
             col = i % 2 * 2
             
-            tk.Label(general_frame, text=label, font=("Segoe UI", 12, "bold"),
+            tk.Label(general_frame, text=label, font=self.fonts.get(12, "bold"),
                     bg="#f0f4f8", anchor="w").grid(row=row, column=col, sticky="w", padx=10, pady=5)
-            tk.Label(general_frame, text=str(value), font=("Segoe UI", 12),
+            tk.Label(general_frame, text=str(value), font=self.fonts.get(12),
                     bg="#f0f4f8", fg="#3498db").grid(row=row, column=col+1, sticky="w", padx=20)
 
         # Difficulty breakdown
         if stats['difficulty_breakdown']:
             difficulty_frame = tk.LabelFrame(stats_frame, text="Difficulty Breakdown", 
-                                           font=("Segoe UI", 14, "bold"), bg="#f0f4f8", fg="#2c3e50")
+                                           font=self.fonts.get(14, "bold"), bg="#f0f4f8", fg="#2c3e50")
             difficulty_frame.pack(fill="x", pady=10, padx=10, ipady=10)
 
             for i, (difficulty, count) in enumerate(stats['difficulty_breakdown'].items()):
-                tk.Label(difficulty_frame, text=f"{difficulty}:", font=("Segoe UI", 12, "bold"),
+                tk.Label(difficulty_frame, text=f"{difficulty}:", font=self.fonts.get(12, "bold"),
                         bg="#f0f4f8", anchor="w").grid(row=i, column=0, sticky="w", padx=10, pady=3)
-                tk.Label(difficulty_frame, text=f"{count} games", font=("Segoe UI", 12),
+                tk.Label(difficulty_frame, text=f"{count} games", font=self.fonts.get(12),
                         bg="#f0f4f8", fg="#e74c3c").grid(row=i, column=1, sticky="w", padx=20)
 
         # Top performers
         if stats['top_players']:
             top_frame = tk.LabelFrame(stats_frame, text="Top Performers", 
-                                    font=("Segoe UI", 14, "bold"), bg="#f0f4f8", fg="#2c3e50")
+                                    font=self.fonts.get(14, "bold"), bg="#f0f4f8", fg="#2c3e50")
             top_frame.pack(fill="x", pady=10, padx=10, ipady=10)
 
             for i, (player, score) in enumerate(stats['top_players'][:5]):
                 rank_text = ["🥇", "🥈", "🥉", "4th", "5th"][i]
-                tk.Label(top_frame, text=f"{rank_text} {player}", font=("Segoe UI", 12, "bold"),
+                tk.Label(top_frame, text=f"{rank_text} {player}", font=self.fonts.get(12, "bold"),
                         bg="#f0f4f8", anchor="w").grid(row=i, column=0, sticky="w", padx=10, pady=3)
-                tk.Label(top_frame, text=f"{score} points", font=("Segoe UI", 12),
+                tk.Label(top_frame, text=f"{score} points", font=self.fonts.get(12),
                         bg="#f0f4f8", fg="#27ae60").grid(row=i, column=1, sticky="w", padx=20)
 
+        # Cards players mix up most, across every deck and player
+        confusions = self.confusion.top_confusions(5)
+        if confusions:
+            confusion_frame = tk.LabelFrame(stats_frame, text="Most Confused Cards",
+                                          font=self.fonts.get(14, "bold"), bg="#f0f4f8", fg="#2c3e50")
+            confusion_frame.pack(fill="x", pady=10, padx=10, ipady=10)
+
+            for i, (count, first, second) in enumerate(confusions):
+                tk.Label(confusion_frame, text=f"{first} ↔ {second}", font=self.fonts.get(12, "bold"),
+                        bg="#f0f4f8", anchor="w").grid(row=i, column=0, sticky="w", padx=10, pady=3)
+                tk.Label(confusion_frame, text=f"{count} times", font=self.fonts.get(12),
+                        bg="#f0f4f8", fg="#9b59b6").grid(row=i, column=1, sticky="w", padx=20)
+
+    @timed("show_help")
     def _show_help(self):
         """Show help/instructions"""
-        self._clear_window()
+        self._clear_window("help")
 
         # Back button
         back_btn = tk.Button(self.window, text="← Back to Menu", command=self._show_main_menu,
-                            font=("Segoe UI", 10), bg="#95a5a6", fg="white")
+                            font=self.fonts.get(10), bg="#95a5a6", fg="white")
         back_btn.pack(anchor="nw", padx=10, pady=5)
 
         # Title
         title = tk.Label(self.window, text="❓ How to Play", 
-                        font=("Segoe UI", 24, "bold"), bg="#f0f4f8", fg="#2c3e50")
+                        font=self.fonts.get(24, "bold"), bg="#f0f4f8", fg="#2c3e50")
         title.pack(pady=20)
 
         # Help content
@@ -784,13 +1134,231 @@ class MemoryGameGUI:
 
         for section_title, content in help_sections:
             section_frame = tk.LabelFrame(help_frame, text=section_title, 
-                                        font=("Segoe UI", 14, "bold"), 
+                                        font=self.fonts.get(14, "bold"), 
                                         bg="#f0f4f8", fg="#2c3e50", padx=15, pady=10)
             section_frame.pack(fill="x", pady=10)
 
-            tk.Label(section_frame, text=content, font=("Segoe UI", 11),
+            tk.Label(section_frame, text=content, font=self.fonts.get(11),
                     bg="#f0f4f8", fg="#34495e", justify="left", wraplength=600).pack(fill="x")
 
+    @timed("show_network_setup")
+    def _show_network_setup(self):
+        """Show the multiplayer connection screen"""
+        self._clear_window("network_setup")
+
+        # Back button
+        back_btn = tk.Button(self.window, text="← Back to Menu", command=self._show_main_menu,
+                            font=self.fonts.get(10), bg="#95a5a6", fg="white")
+        back_btn.pack(anchor="nw", padx=10, pady=5)
+
+        # Title
+        title = tk.Label(self.window, text="🌐 Multiplayer", 
+                        font=self.fonts.get(24, "bold"), bg="#f0f4f8", fg="#2c3e50")
+        title.pack(pady=20)
+
+        form_frame = tk.LabelFrame(self.window, text="Connection", 
+                                 font=self.fonts.get(12, "bold"),
+                                 bg="#f0f4f8", fg="#2c3e50", padx=10, pady=10)
+        form_frame.pack(pady=10, padx=20, fill="x")
+
+        fields = [
+            ("Host Address:", self.network_address_var),
+            ("Port:", self.network_port_var),
+            ("Room:", self.network_room_var),
+            ("Player Name:", self.username_var),
+        ]
+
+        for row, (label, variable) in enumerate(fields):
+            tk.Label(form_frame, text=label, font=self.fonts.get(11),
+                    bg="#f0f4f8").grid(row=row, column=0, sticky="w", pady=3)
+            tk.Entry(form_frame, textvariable=variable, width=25,
+                    font=self.fonts.get(11)).grid(row=row, column=1, sticky="w", padx=10, pady=3)
+
+        if self.username_var.get() == "Guest":
+            self.username_var.set("")
+
+        tk.Label(form_frame, text="Players:", font=self.fonts.get(11),
+                bg="#f0f4f8").grid(row=len(fields), column=0, sticky="w", pady=3)
+        tk.Spinbox(form_frame, from_=MIN_SEATS, to=MAX_SEATS, textvariable=self.network_seats_var,
+                  width=5, state="readonly").grid(row=len(fields), column=1, sticky="w", padx=10, pady=3)
+
+        tk.Label(form_frame, text="Template:", font=self.fonts.get(11),
+                bg="#f0f4f8").grid(row=len(fields) + 1, column=0, sticky="w", pady=3)
+        ttk.Combobox(form_frame, textvariable=self.selected_template,
+                    values=self.templates.names(),
+                    state="readonly", width=25).grid(row=len(fields) + 1, column=1, sticky="w",
+                                                     padx=10, pady=3)
+
+        tk.Checkbutton(form_frame, text="Host this game on my machine",
+                      variable=self.network_hosting_var, font=self.fonts.get(11),
+                      bg="#f0f4f8").grid(row=len(fields) + 2, column=0, columnspan=2, sticky="w", pady=3)
+
+        tk.Button(self.window, text="▶ Connect", command=self._connect_network,
+                 font=self.fonts.get(16, "bold"), bg="#16a085", fg="white",
+                 height=2, relief="flat", cursor="hand2").pack(pady=20)
+
+    def _connect_network(self):
+        """Validate the connection form, start a local host if asked and join the room"""
+        name = self.username_var.get().strip()
+        if not name or name == "Guest":
+            messagebox.showwarning("Error", "Please enter a valid player name.", parent=self.window)
+            return
+
+        try:
+            port = int(self.network_port_var.get())
+        except ValueError:
+            messagebox.showwarning("Error", "Please enter a valid port number.", parent=self.window)
+            return
+
+        # Pairs are only used by the host when this player creates the room
+        pairs = self.templates.get(self.selected_template.get())
+        if len(pairs) < 2:
+            messagebox.showwarning("Error", "Please select a template with at least 2 pairs.", parent=self.window)
+            return
+
+        host_thread = None
+        if self.network_hosting_var.get():
+            host_thread = HostThread("0.0.0.0", port)
+            try:
+                host_thread.start()
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not start the game host:\n{e}", parent=self.window)
+                return
+
+        client = GameClient(self.network_address_var.get().strip(), port,
+                            self.network_room_var.get().strip(), name,
+                            pairs=pairs, seats=int(self.network_seats_var.get()))
+        self._show_network_game_screen(client, host_thread)
+
+    @timed("show_network_game_screen")
+    def _show_network_game_screen(self, client, host_thread=None):
+        """Display a multiplayer game; the board appears once the host welcomes us"""
+        self._clear_window("network_game_screen")
+        self.logic = None
+        self.network_players = []
+        self.network_scores = []
+        self.network_turn = None
+        self.network_index = None
+
+        # Game info header
+        info_frame = tk.Frame(self.window, bg="#34495e", height=80)
+        info_frame.pack(fill="x", pady=(0, 10))
+        info_frame.pack_propagate(False)
+
+        self.network_status_label = tk.Label(info_frame, text="Connecting...",
+                                             font=self.fonts.get(12, "bold"), bg="#34495e", fg="white")
+        self.network_status_label.pack(side="left", padx=20, pady=10)
+
+        self.network_scores_label = tk.Label(info_frame, text="",
+                                             font=self.fonts.get(12, "bold"), bg="#34495e", fg="#f39c12")
+        self.network_scores_label.pack(side="right", padx=20, pady=10)
+
+        # Control buttons
+        control_frame = tk.Frame(self.window, bg="#f0f4f8")
+        control_frame.pack(side="bottom", pady=15)
+
+        tk.Button(control_frame, text="🏠 Main Menu", command=self._show_main_menu,
+                 font=self.fonts.get(12, "bold"), bg="#34495e", fg="white").pack(side="left", padx=10)
+
+        self.network_host = host_thread
+        self.network = ClientThread(client)
+        self.network.start()
+        self._poll_network()
+
+    def _poll_network(self):
+        """Apply deltas received by the network thread"""
+        try:
+            while self.network is not None:
+                self._on_network_event(self.network.events.get_nowait())
+        except queue.Empty:
+            pass
+        if self.network is not None:
+            self.network_poll_id = self.window.after(NETWORK_POLL_MS, self._poll_network)
+
+    def _on_network_event(self, event):
+        """Update the board from one host message"""
+        kind = event["type"]
+        if kind == "welcome":
+            self.network_index = event["index"]
+            # After a reconnect the board is kept and missed deltas are replayed
+            if not self.buttons:
+                keys = [f"block_{i}" for i in range(event["cards"])]
+                self._create_grid(keys, self._on_network_click)
+        elif kind == "join":
+            self.network_players.append(event["player"])
+            self.network_scores.append(0)
+        elif kind == "start":
+            self.network_turn = event["turn"]
+        elif kind == "flip":
+            key = f"block_{event['card']}"
+            hide_id = self.network_hides.pop(key, None)
+            if hide_id:
+                self.window.after_cancel(hide_id)
+            self._reveal_card(key, event["value"])
+        elif kind == "match":
+            for card in event["cards"]:
+                self.buttons[f"block_{card}"].config(bg="#27ae60", fg="white")
+            self.network_scores = event["scores"]
+        elif kind in ("miss", "pass"):
+            # "pass": the player whose turn it was left the room
+            for card in event["cards"]:
+                key = f"block_{card}"
+                self.network_hides[key] = self.window.after(1200, lambda k=key: self._hide_network_card(k))
+            self.network_turn = event["turn"]
+        elif kind == "over":
+            best = max(event["scores"])
+            winners = [p for p, score in zip(self.network_players, event["scores"]) if score == best]
+            messagebox.showinfo("Game Over", f"Winner: {', '.join(winners)} with {best} pairs!",
+                                parent=self.window)
+            self._show_main_menu()
+            return
+        elif kind == "error":
+            self.network_status_label.config(text=event["message"])
+            return
+        elif kind == "disconnected":
+            self.network_status_label.config(text="Connection lost, reconnecting...")
+            return
+
+        self._update_network_status()
+
+    def _update_network_status(self):
+        """Show whose turn it is and the current scores"""
+        if self.network_turn is None:
+            status = f"Waiting for players ({len(self.network_players)}/{self.network_seats_var.get()})"
+        elif self.network_turn == self.network_index:
+            status = "Your turn!"
+        else:
+            status = f"{self.network_players[self.network_turn]}'s turn"
+        self.network_status_label.config(text=status)
+        self.network_scores_label.config(text="   ".join(
+            f"{player}: {score}" for player, score in zip(self.network_players, self.network_scores)))
+
+    def _hide_network_card(self, key):
+        self.network_hides.pop(key, None)
+        if key in self.buttons:
+            self._hide_card(key)
+
+    def _on_network_click(self, key):
+        """Send a flip to the host; it decides whether the move is allowed"""
+        if self.network is None or self.network_turn != self.network_index:
+            return
+        self.network.flip(int(key.split("_")[1]))
+
+    def _stop_network(self):
+        """Disconnect from the room and stop the local host, if any"""
+        if self.network_poll_id:
+            self.window.after_cancel(self.network_poll_id)
+            self.network_poll_id = None
+        for hide_id in self.network_hides.values():
+            self.window.after_cancel(hide_id)
+        self.network_hides.clear()
+        if self.network:
+            self.network.close()
+            self.network = None
+        if self.network_host:
+            self.network_host.stop()
+            self.network_host = None
+
     def _save_set(self):
         """Save current pairs to file"""
         pairs = []
@@ -801,28 +1369,30 @@ class MemoryGameGUI:
                 pairs.append((key, value))
 
         if not pairs:
-            messagebox.showwarning("Error", "No valid pairs to save.")
+            messagebox.showwarning("Error", "No valid pairs to save.", parent=self.window)
             return
 
         file_path = filedialog.asksaveasfilename(
             defaultextension=".json",
             filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            title="Save Memory Set"
+            title="Save Memory Set",
+            parent=self.window
         )
 
         if file_path:
             try:
                 with open(file_path, 'w', encoding='utf-8') as f:
                     json.dump(pairs, f, ensure_ascii=False, indent=4)
-                messagebox.showinfo("Success", "Set saved successfully!")
+                messagebox.showinfo("Success", "Set saved successfully!", parent=self.window)
             except Exception as e:
-                messagebox.showerror("Error", f"Could not save the file:\n{e}")
+                messagebox.showerror("Error", f"Could not save the file:\n{e}", parent=self.window)
 
     def _load_set(self):
         """Load pairs from file"""
         file_path = filedialog.askopenfilename(
             filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            title="Load Memory Set"
+            title="Load Memory Set",
+            parent=self.window
         )
 
         if file_path:
@@ -840,29 +1410,99 @@ class MemoryGameGUI:
                     self._add_pair_fields(key, value)
 
                 self.selected_template.set("Custom")
-                messagebox.showinfo("Success", "Set loaded successfully!")
+                messagebox.showinfo("Success", "Set loaded successfully!", parent=self.window)
             except Exception as e:
-                messagebox.showerror("Error", f"Invalid JSON or file error:\n{e}")
+                messagebox.showerror("Error", f"Invalid JSON or file error:\n{e}", parent=self.window)
 
     def _start_timer(self):
+        """Show the game timer and keep it updated from the shared clock"""
+        self._update_timer()
+        self.clock.add(self._update_timer)
+
+    def _update_timer(self):
         """Update game timer"""
-        if self.timer_running:
-            elapsed = int(time.time() - self.start_time)
-            try:
-                self.timer_label.config(text=f"Time: {elapsed}s")
-            except tk.TclError:
-                return
-            self.after_id = self.window.after(1000, self._start_timer)
+        if not self.timer_running:
+            self.clock.discard(self._update_timer)
+            return
+        elapsed = int(time.time() - self.start_time)
+        try:
+            self.timer_label.config(text=f"Time: {elapsed}s")
+        except tk.TclError:
+            self.clock.discard(self._update_timer)
+
+    def _after(self, delay_ms, callback):
+        """Schedule a callback that is cancelled when the screen is left"""
+        def run():
+            self.pending_afters.discard(after_id)
+            callback()
+
+        after_id = self.window.after(delay_ms, run)
+        self.pending_afters.add(after_id)
+        return after_id
+
+    def _cancel_afters(self):
+        """Stop the timer, the network and every callback scheduled by the screen"""
+        self.timer_running = False
+        self.clock.discard(self._update_timer)
+
+        for after_id in self.pending_afters:
+            self.window.after_cancel(after_id)
+        self.pending_afters.clear()
 
-    def _clear_window(self):
-        """Clear all widgets from window"""
-        if self.after_id:
-            self.window.after_cancel(self.after_id)
-            self.after_id = None
+        self._stop_network()
+
+    def _clear_window(self, screen=None):
+        """Clear all widgets from window and release the previous screen's state"""
+        self._cancel_afters()
+
+        # Leaving the board on purpose abandons the game
+        if self.current_screen == "game_screen":
+            self.checkpoint.clear()
+            self._flush_confusions()
 
         for widget in self.window.winfo_children():
             widget.destroy()
 
+        # Drop references that would otherwise keep destroyed widgets alive
+        self.buttons = {}
+        self.card_images = {}
+        self.picture_faces = {}
+        self.pending_faces = {}
+        self.board_pictures = []
+        self.entries = []
+        self.board_keys = []
+        self.board_layout = None
+        self.board_canvas = None
+        self.board_scrollbar = None
+        self.board_window = None
+        self.layout_after_id = None
+        self.waiting = False
+        self.first_choice = None
+        self.timer_label = None
+        self.moves_label = None
+        self.name_frame = None
+        self.name_entry = None
+        self.name_suggestions = None
+        self.scrollable_frame = None
+        self.form_frame = None
+        self.leaderboard_frame = None
+        self.network_status_label = None
+        self.network_scores_label = None
+
+        if self.diagnostics:
+            self.diagnostics.snapshot(self.current_screen, screen)
+        self.current_screen = screen
+
+    def close(self):
+        """Close this window; an unfinished game stays checkpointed for resuming"""
+        self._cancel_afters()
+        self.checkpoint.close()
+        self._flush_confusions()
+        self.images.unsubscribe(self._on_image_ready)
+        if self.window is not self.shared.root:
+            self.window.destroy()
+        self.shared.detach(self)
+
     def run(self):
         """Start the application"""
-        self.window.mainloop()
+        self.shared.run()
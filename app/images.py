@@ -0,0 +1,120 @@
+import base64
+import io
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; Tk decodes PNG/GIF/PPM itself
+    Image = None
+
+IMAGE_EXTENSIONS = (".png", ".gif", ".ppm", ".pgm")
+PILLOW_EXTENSIONS = (".jpg", ".jpeg", ".bmp", ".webp")
+
+# How often finished decodes are turned into Tk images, and how many per tick
+POLL_MS = 30
+IMAGES_PER_POLL = 4
+
+def is_image_path(value):
+    """True if a card value names an image file (extension check only, no disk I/O)"""
+    extensions = IMAGE_EXTENSIONS + (PILLOW_EXTENSIONS if Image else ())
+    return value.lower().endswith(extensions)
+
+def _decode(path, box):
+    """Worker thread: read and, with Pillow, decode and downscale an image"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if Image is None:
+        return "raw", data
+    with Image.open(io.BytesIO(data)) as img:
+        img.thumbnail(box)
+        buffer = io.BytesIO()
+        img.convert("RGB").save(buffer, format="PPM")
+    return "ppm", base64.b64encode(buffer.getvalue())
+
+class ImageCache:
+    def __init__(self, root, budget_bytes=32 * 1024 * 1024, workers=2):
+        self.root = root
+        self.budget_bytes = budget_bytes
+        self.size_bytes = 0
+        self._images = OrderedDict()
+        self._pending = {}
+        self._failed = set()
+        self._callbacks = []
+        self._poll_id = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="memo-images")
+
+    def prefetch(self, paths, box, callback=None):
+        """Start decoding images in the background so later get() calls never block"""
+        if callback and callback not in self._callbacks:
+            self._callbacks.append(callback)
+        for path in paths:
+            key = (path, box)
+            if key in self._images or key in self._pending or key in self._failed:
+                continue
+            self._pending[key] = self._executor.submit(_decode, path, box)
+        if self._pending and self._poll_id is None:
+            self._poll_id = self.root.after(POLL_MS, self._poll)
+
+    def unsubscribe(self, callback):
+        """Stop notifying a callback, e.g. once its window is closed"""
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def get(self, path, box):
+        """Return the decoded image or None if it is not ready; never touches disk"""
+        key = (path, box)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+        return image
+
+    def _poll(self):
+        """Main thread: turn a few finished decodes into PhotoImages"""
+        self._poll_id = None
+        converted = 0
+        for key, future in list(self._pending.items()):
+            if converted >= IMAGES_PER_POLL:
+                break
+            if not future.done():
+                continue
+            del self._pending[key]
+            converted += 1
+            try:
+                image = self._to_photo(key[1], *future.result())
+            except Exception as e:
+                print(f"Error loading image {key[0]}: {e}")
+                self._failed.add(key)
+                continue
+            self._store(key, image)
+            for callback in self._callbacks:
+                callback(key[0])
+        if self._pending:
+            self._poll_id = self.root.after(POLL_MS, self._poll)
+
+    def _to_photo(self, box, kind, data):
+        if kind == "ppm":
+            return tk.PhotoImage(master=self.root, data=data, format="ppm")
+        image = tk.PhotoImage(master=self.root, data=data)
+        # Without Pillow only integer downscaling is available
+        factor = max(1, -(-image.width() // box[0]), -(-image.height() // box[1]))
+        return image.subsample(factor) if factor > 1 else image
+
+    def _store(self, key, image):
+        cost = image.width() * image.height() * 4
+        self._images[key] = image
+        self.size_bytes += cost
+        while self.size_bytes > self.budget_bytes and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self.size_bytes -= evicted.width() * evicted.height() * 4
+
+    def close(self):
+        """Stop the worker threads"""
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=False)
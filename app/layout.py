@@ -0,0 +1,69 @@
+import functools
+import math
+from collections import namedtuple
+
+# Window sizes are rounded down to buckets so nearby sizes share one layout
+SIZE_BUCKET = 24
+CARD_GAP = 10
+CARD_ASPECT = 140 / 64
+MIN_CARD_SIZE = (48, 24)
+MAX_CARD_SIZE = (280, 128)
+
+class BoardLayout(namedtuple("BoardLayout", "cols rows card_width card_height x0 y0 gap")):
+    __slots__ = ()
+
+    def position(self, index):
+        """Top-left pixel position of the card at index"""
+        row, col = divmod(index, self.cols)
+        return (self.x0 + col * (self.card_width + self.gap),
+                self.y0 + row * (self.card_height + self.gap))
+
+    @property
+    def height(self):
+        """Pixel height of the grid; taller than the board when it has to scroll"""
+        return self.y0 + self.rows * self.card_height + (self.rows - 1) * self.gap
+
+def compute_layout(width, height, count):
+    """Grid shape and card size for count cards in a width x height board"""
+    return _layout(max(1, width // SIZE_BUCKET), max(1, height // SIZE_BUCKET), max(1, count))
+
+@functools.lru_cache(maxsize=256)
+def _layout(width_bucket, height_bucket, count):
+    width = width_bucket * SIZE_BUCKET
+    height = height_bucket * SIZE_BUCKET
+
+    # Gaps shrink before cards would have to go below their minimum size
+    for gap in (CARD_GAP, CARD_GAP // 2, 0):
+        best = _best_grid(width, height, count, gap)
+        if best is not None:
+            _, cols, rows, card_width, card_height = best
+            break
+    else:
+        # Too many cards even without gaps: fill the width and let the board scroll
+        gap = CARD_GAP // 2
+        cols = max(1, min(count, (width + gap) // (MIN_CARD_SIZE[0] + gap)))
+        rows = math.ceil(count / cols)
+        card_width = max(MIN_CARD_SIZE[0], min(MAX_CARD_SIZE[0], (width - gap * (cols - 1)) // cols))
+        card_height = max(MIN_CARD_SIZE[1], min(MAX_CARD_SIZE[1], int(card_width / CARD_ASPECT)))
+
+    # Center the grid in the board
+    x0 = max(0, (width - cols * card_width - (cols - 1) * gap) // 2)
+    y0 = max(0, (height - rows * card_height - (rows - 1) * gap) // 2)
+    return BoardLayout(cols, rows, card_width, card_height, x0, y0, gap)
+
+def _best_grid(width, height, count, gap):
+    """Grid with the largest cards that fits the board, or None below the minimum size"""
+    best = None
+    for cols in range(1, count + 1):
+        rows = math.ceil(count / cols)
+        card_width = min(MAX_CARD_SIZE[0], (width - gap * (cols - 1)) // cols)
+        card_height = min(MAX_CARD_SIZE[1], (height - gap * (rows - 1)) // rows)
+        # Cards keep roughly their usual shape; score by the usable text area
+        card_width = min(card_width, int(card_height * CARD_ASPECT * 1.5))
+        card_height = min(card_height, int(card_width / CARD_ASPECT * 1.5))
+        if card_width < MIN_CARD_SIZE[0] or card_height < MIN_CARD_SIZE[1]:
+            continue
+        area = card_width * card_height
+        if best is None or area > best[0]:
+            best = (area, cols, rows, card_width, card_height)
+    return best
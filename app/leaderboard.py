@@ -1,18 +1,71 @@
 import json
 import os
+import zlib
 from datetime import datetime
 from collections import defaultdict
+from app.cache import LRUCache
+
+# Hot tier: the best and the most recent scores always stay in memory
+HOT_TOP_SCORES = 100
+HOT_RECENT_SCORES = 100
+# Older scores are rolled into immutable compressed segments of this size
+SEGMENT_SIZE = 500
 
 class LeaderboardManager:
-    def __init__(self, filename="leaderboard.json"):
+    def __init__(self, filename="leaderboard.json", players=None):
         self.filename = filename
+        self.archive_dir = os.path.splitext(filename)[0] + "_archive"
+        self.index_file = os.path.join(self.archive_dir, "index.json")
+        self.players = players
         self.scores = self._load_scores()
+        self.segments = self._load_index()
+        self._segment_cache = LRUCache(maxsize=4)
+        self._player_best = {}
+        if players is not None:
+            self._migrate_player_ids()
+
+    def _migrate_player_ids(self):
+        """Key scores saved before the player registry by registered id instead of name"""
+        legacy_scores = [s for s in self.scores if not s.get('player_id')]
+        # Archived summaries written before ids are keyed by the player's name
+        legacy_segments = [segment for segment in self.segments
+                           if any(key == summary[3] for key, summary in segment['players'].items())]
+        if not legacy_scores and not legacy_segments:
+            return
+
+        names = [s['player_name'] for s in legacy_scores]
+        names += [summary[3] for segment in legacy_segments for summary in segment['players'].values()]
+        ids = self.players.register_many(names)
+
+        for score in legacy_scores:
+            score['player_id'] = ids[score['player_name']]
+        if legacy_scores:
+            self._save_scores()
+
+        for segment in legacy_segments:
+            players = {}
+            for key, summary in segment['players'].items():
+                player = ids[summary[3]] if key == summary[3] else key
+                if player in players:
+                    # Names that differed only in case or spacing are one player now
+                    merged = players[player]
+                    merged[0] += summary[0]
+                    merged[1] += summary[1]
+                    merged[2] = max(merged[2], summary[2])
+                else:
+                    players[player] = list(summary)
+            segment['players'] = players
+        if legacy_segments:
+            try:
+                _write_atomic(self.index_file, json.dumps(self.segments, ensure_ascii=False).encode('utf-8'))
+            except Exception as e:
+                print(f"Error saving leaderboard archive index: {e}")
 
     def _load_scores(self):
         """Load scores from file"""
         if not os.path.exists(self.filename):
             return []
-        
+
         try:
             with open(self.filename, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -20,30 +73,36 @@ class LeaderboardManager:
                 for score in data:
                     if isinstance(score.get('date'), str):
                         score['date'] = datetime.fromisoformat(score['date'])
+                data.sort(key=lambda x: x['score'], reverse=True)
                 return data
         except Exception as e:
             print(f"Error loading leaderboard: {e}")
             return []
 
+    def _load_index(self):
+        """Load the per-segment summaries of archived scores"""
+        if not os.path.exists(self.index_file):
+            return []
+
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading leaderboard archive index: {e}")
+            return []
+
     def _save_scores(self):
         """Save scores to file"""
         try:
-            # Convert datetime objects to strings for JSON serialization
-            data_to_save = []
-            for score in self.scores:
-                score_copy = score.copy()
-                if isinstance(score_copy.get('date'), datetime):
-                    score_copy['date'] = score_copy['date'].isoformat()
-                data_to_save.append(score_copy)
-            
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=4)
+            _write_atomic(self.filename, json.dumps(_serialize(self.scores), ensure_ascii=False,
+                                                    indent=4).encode('utf-8'))
         except Exception as e:
             print(f"Error saving leaderboard: {e}")
 
-    def add_score(self, player_name, score, time_taken, moves, difficulty):
+    def add_score(self, player_name, score, time_taken, moves, difficulty, player_id=None):
         """Add a new score to the leaderboard"""
         score_entry = {
+            'player_id': player_id,
             'player_name': player_name,
             'score': score,
             'time': time_taken,
@@ -51,67 +110,217 @@ class LeaderboardManager:
             'difficulty': difficulty,
             'date': datetime.now()
         }
-        
+
         self.scores.append(score_entry)
         self.scores.sort(key=lambda x: x['score'], reverse=True)
-        
-        # Keep only top 100 scores to prevent file from growing too large
-        self.scores = self.scores[:100]
-        
+
+        # Keep cached personal bests current
+        player = _player_key(score_entry)
+        for key in ((player, None), (player, difficulty)):
+            if key in self._player_best:
+                best = self._player_best[key]
+                if best is None or score > best['score']:
+                    self._player_best[key] = score_entry
+
+        # Roll scores that are neither top nor recent into the archive
+        if len(self.scores) >= HOT_TOP_SCORES + HOT_RECENT_SCORES + SEGMENT_SIZE:
+            self._archive_cold_scores()
+
         self._save_scores()
 
+    def _archive_cold_scores(self):
+        """Move cold scores from the hot tier into a new compressed segment"""
+        recent = sorted(self.scores, key=lambda x: x['date'], reverse=True)[:HOT_RECENT_SCORES]
+        keep = {id(s) for s in self.scores[:HOT_TOP_SCORES]} | {id(s) for s in recent}
+        cold = [s for s in self.scores if id(s) not in keep]
+        if not cold:
+            return
+
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            segment_file = f"segment_{len(self.segments):06d}.json.z"
+            payload = json.dumps(_serialize(cold), ensure_ascii=False).encode('utf-8')
+            _write_atomic(os.path.join(self.archive_dir, segment_file), zlib.compress(payload, 9))
+
+            segments = self.segments + [_summarize(segment_file, cold)]
+            _write_atomic(self.index_file, json.dumps(segments, ensure_ascii=False).encode('utf-8'))
+        except Exception as e:
+            print(f"Error archiving leaderboard scores: {e}")
+            return
+
+        self.segments = segments
+        self.scores = [s for s in self.scores if id(s) in keep]
+
+    def _read_segment(self, segment):
+        """Decompress an archived segment (scores sorted by score, best first)"""
+        scores = self._segment_cache.get(segment['file'])
+        if scores is None:
+            try:
+                with open(os.path.join(self.archive_dir, segment['file']), 'rb') as f:
+                    scores = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+            except Exception as e:
+                print(f"Error reading leaderboard segment {segment['file']}: {e}")
+                return []
+            for score in scores:
+                score['date'] = datetime.fromisoformat(score['date'])
+                # Segments are immutable; ids for pre-registry scores are filled in on read
+                if not score.get('player_id') and self.players is not None:
+                    score['player_id'] = self.players.lookup(score['player_name'])
+            self._segment_cache.put(segment['file'], scores)
+        return scores
+
     def get_top_scores(self, difficulty=None, limit=50):
         """Get top scores, optionally filtered by difficulty"""
         filtered_scores = self.scores
-        
+
         if difficulty:
             filtered_scores = [s for s in self.scores if s['difficulty'] == difficulty]
-        
-        return filtered_scores[:limit]
 
-    def get_player_best(self, player_name, difficulty=None):
+        top_scores = filtered_scores[:limit]
+
+        # Only open segments whose best score could still make the list
+        def segment_best(segment):
+            if difficulty:
+                return segment['difficulty_max'].get(difficulty)
+            return segment['max_score']
+
+        candidates = [s for s in self.segments if segment_best(s) is not None]
+        for segment in sorted(candidates, key=segment_best, reverse=True):
+            if len(top_scores) >= limit and segment_best(segment) <= top_scores[-1]['score']:
+                break
+            archived = self._read_segment(segment)
+            if difficulty:
+                archived = [s for s in archived if s['difficulty'] == difficulty]
+            top_scores = sorted(top_scores + archived[:limit],
+                                key=lambda x: x['score'], reverse=True)[:limit]
+
+        return top_scores
+
+    def get_player_best(self, player_name, difficulty=None, player_id=None):
         """Get player's best score"""
-        player_scores = [s for s in self.scores if s['player_name'] == player_name]
-        
+        player = player_id or player_name
+        if (player, difficulty) not in self._player_best:
+            self._player_best[(player, difficulty)] = self._find_player_best(player, difficulty)
+        return self._player_best[(player, difficulty)]
+
+    def _find_player_best(self, player, difficulty):
+        """Search the hot tier and any segment that could hold a better score"""
+        player_scores = [s for s in self.scores if _player_key(s) == player]
+
         if difficulty:
             player_scores = [s for s in player_scores if s['difficulty'] == difficulty]
-        
-        return player_scores[0] if player_scores else None
+
+        best = player_scores[0] if player_scores else None
+
+        for segment in self.segments:
+            summary = segment['players'].get(player)
+            if not summary or (best and summary[2] <= best['score']):
+                continue
+            for score in self._read_segment(segment):
+                if _player_key(score) == player and (
+                        not difficulty or score['difficulty'] == difficulty):
+                    if not best or score['score'] > best['score']:
+                        best = score
+                    break
+
+        return best
 
     def get_statistics(self):
         """Get general statistics"""
-        if not self.scores:
+        if not self.scores and not self.segments:
             return None
 
-        total_games = len(self.scores)
-        total_players = len(set(score['player_name'] for score in self.scores))
-        avg_score = sum(score['score'] for score in self.scores) / total_games
-        avg_time = sum(score['time'] for score in self.scores) / total_games
-        avg_moves = sum(score['moves'] for score in self.scores) / total_games
+        # Archived segments contribute through their summaries only
+        total_games = len(self.scores) + sum(s['count'] for s in self.segments)
+        score_sum = sum(score['score'] for score in self.scores) + sum(s['score_sum'] for s in self.segments)
+        time_sum = sum(score['time'] for score in self.scores) + sum(s['time_sum'] for s in self.segments)
+        moves_sum = sum(score['moves'] for score in self.scores) + sum(s['moves_sum'] for s in self.segments)
 
         # Difficulty breakdown
         difficulty_breakdown = defaultdict(int)
         for score in self.scores:
             difficulty_breakdown[score['difficulty']] += 1
+        for segment in self.segments:
+            for difficulty, count in segment['difficulty_counts'].items():
+                difficulty_breakdown[difficulty] += count
 
-        # Top players by average score
-        player_scores = defaultdict(list)
+        # Top players by average score, grouped by player id when known
+        player_totals = defaultdict(lambda: [0, 0, None])
         for score in self.scores:
-            player_scores[score['player_name']].append(score['score'])
-        
+            totals = player_totals[_player_key(score)]
+            totals[0] += 1
+            totals[1] += score['score']
+            totals[2] = totals[2] or score['player_name']
+        for segment in self.segments:
+            for player, summary in segment['players'].items():
+                totals = player_totals[player]
+                totals[0] += summary[0]
+                totals[1] += summary[1]
+                totals[2] = totals[2] or summary[3]
+
         top_players = []
-        for player, scores in player_scores.items():
-            avg_player_score = sum(scores) / len(scores)
-            top_players.append((player, int(avg_player_score)))
-        
+        for count, total, name in player_totals.values():
+            top_players.append((name, int(total / count)))
+
         top_players.sort(key=lambda x: x[1], reverse=True)
 
         return {
             'total_games': total_games,
-            'total_players': total_players,
-            'avg_score': avg_score,
-            'avg_time': avg_time,
-            'avg_moves': avg_moves,
+            'total_players': len(player_totals),
+            'avg_score': score_sum / total_games,
+            'avg_time': time_sum / total_games,
+            'avg_moves': moves_sum / total_games,
             'difficulty_breakdown': dict(difficulty_breakdown),
             'top_players': top_players
         }
+
+def _player_key(score):
+    """Registered player id, or the name for scores saved before ids existed"""
+    return score.get('player_id') or score['player_name']
+
+def _serialize(scores):
+    """Copy scores with datetime objects converted to ISO strings"""
+    data = []
+    for score in scores:
+        score_copy = score.copy()
+        if isinstance(score_copy.get('date'), datetime):
+            score_copy['date'] = score_copy['date'].isoformat()
+        data.append(score_copy)
+    return data
+
+def _summarize(segment_file, scores):
+    """Summary stored in the archive index so queries can skip whole segments"""
+    difficulty_counts = defaultdict(int)
+    difficulty_max = {}
+    players = {}
+    for score in scores:
+        difficulty = score['difficulty']
+        difficulty_counts[difficulty] += 1
+        difficulty_max[difficulty] = max(difficulty_max.get(difficulty, score['score']), score['score'])
+        player = players.setdefault(_player_key(score), [0, 0, score['score'], score['player_name']])
+        player[0] += 1
+        player[1] += score['score']
+        player[2] = max(player[2], score['score'])
+
+    dates = [score['date'] for score in scores]
+    return {
+        'file': segment_file,
+        'count': len(scores),
+        'min_score': min(score['score'] for score in scores),
+        'max_score': max(score['score'] for score in scores),
+        'first_date': min(dates).isoformat(),
+        'last_date': max(dates).isoformat(),
+        'difficulty_counts': dict(difficulty_counts),
+        'difficulty_max': difficulty_max,
+        'score_sum': sum(score['score'] for score in scores),
+        'time_sum': sum(score['time'] for score in scores),
+        'moves_sum': sum(score['moves'] for score in scores),
+        'players': players
+    }
+
+def _write_atomic(filename, data):
+    """Write bytes to a temporary file and rename it over the target"""
+    tmp_name = filename + ".tmp"
+    with open(tmp_name, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_name, filename)
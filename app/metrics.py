@@ -0,0 +1,150 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 16, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value_ms):
+        """Record one sample"""
+        self.counts[bisect.bisect_left(BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+
+class Metrics:
+    def __init__(self, filename=None, port=None):
+        self.filename = filename
+        self.port = port
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def observe(self, name, value_ms, **labels):
+        """Record a duration in milliseconds under a metric name and labels"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value_ms)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000, **labels)
+
+    def render(self):
+        """Render all histograms in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            items = sorted(self.histograms.items())
+            seen = set()
+            for (name, labels), histogram in items:
+                if name not in seen:
+                    lines.append(f"# TYPE {name} histogram")
+                    seen.add(name)
+                cumulative = 0
+                for bound, count in zip(BUCKETS_MS + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels, le=bound)} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.total:.3f}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self):
+        """Write the current metrics to the configured file"""
+        if not self.filename:
+            return
+        try:
+            tmp_name = self.filename + ".tmp"
+            with open(tmp_name, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.replace(tmp_name, self.filename)
+        except Exception as e:
+            print(f"Error writing metrics: {e}")
+
+    def serve(self):
+        """Expose the metrics on a localhost-only HTTP endpoint"""
+        if not self.port or self._server:
+            return
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        except OSError as e:
+            print(f"Error starting metrics endpoint: {e}")
+            return
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        """Flush the metrics file and stop the endpoint"""
+        self.dump()
+        if self._server:
+            self._server.shutdown()
+            self._server = None
+
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+def metrics_from_env():
+    """Create a Metrics instance when MEMO_METRICS_FILE or MEMO_METRICS_PORT is set"""
+    filename = os.environ.get("MEMO_METRICS_FILE")
+    port = os.environ.get("MEMO_METRICS_PORT")
+    if not filename and not port:
+        return None
+    try:
+        port = int(port) if port else None
+    except ValueError:
+        # Only the endpoint is dropped; MEMO_METRICS_FILE still gets its metrics
+        print(f"Error: MEMO_METRICS_PORT must be a number, got {port!r}; the metrics endpoint is off")
+        port = None
+        if not filename:
+            return None
+    return Metrics(filename=filename, port=port)
+
+def timer(metrics, name, **labels):
+    """Metrics.timer that does nothing when instrumentation is off"""
+    if metrics is None:
+        return nullcontext()
+    return metrics.timer(name, **labels)
+
+def timed(screen):
+    """Decorator recording how long a MemoryGameGUI screen build takes"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.metrics is None:
+                return method(self, *args, **kwargs)
+            with self.metrics.timer("memo_screen_build_ms", screen=screen):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,391 @@
+import argparse
+import asyncio
+import json
+import queue
+import secrets
+import threading
+from app.game_logic import MemoryGameLogic
+
+DEFAULT_PORT = 8765
+MIN_SEATS = 2
+MAX_SEATS = 4
+
+# Longest accepted message line, and how much unsent data a client may pile up
+MAX_LINE_BYTES = 64 * 1024
+WRITE_BUFFER_LIMIT = 256 * 1024
+RECONNECT_DELAY = 1.0
+
+def _encode(message):
+    return (json.dumps(message, ensure_ascii=False, separators=(",", ":")) + "\n").encode('utf-8')
+
+def _is_pair(pair):
+    return (isinstance(pair, list) and len(pair) == 2
+            and all(isinstance(value, str) for value in pair))
+
+class Room:
+    def __init__(self, name, pairs, seats):
+        self.name = name
+        self.logic = MemoryGameLogic(pairs)
+        self.cards = len(self.logic.blocks)
+        self.seats = seats
+        self.players = []
+        self.scores = []
+        # Per-seat resume tokens: only their holder may take over a seat
+        self.tokens = []
+        self.writers = {}
+        self.turn = 0
+        self.first = None
+        self.started = False
+        self.over = False
+        # Every delta ever sent, already encoded, so resyncs are a replay
+        self.log = []
+
+    def record(self, message):
+        """Assign the next sequence number to a delta and keep it for resync"""
+        message["seq"] = len(self.log) + 1
+        data = _encode(message)
+        self.log.append(data)
+        return data
+
+class GameHost:
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.rooms = {}
+        self.server = None
+
+    async def start(self):
+        """Start listening; port 0 picks a free port, stored in self.port"""
+        self.server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                 limit=MAX_LINE_BYTES)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Run until cancelled"""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        """Stop accepting clients and disconnect everyone"""
+        for room in self.rooms.values():
+            for writer in room.writers.values():
+                writer.close()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        self.rooms.clear()
+
+    async def _handle(self, reader, writer):
+        room = player = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    kind = message["type"]
+                except (ValueError, KeyError, TypeError):
+                    self._send_error(writer, "Malformed message")
+                    continue
+
+                if kind == "join":
+                    room, player = self._join(message, writer)
+                elif room is None:
+                    self._send_error(writer, "Join a room first")
+                elif kind == "flip":
+                    self._flip(room, player, message.get("card"), writer)
+                elif kind == "resync":
+                    self._replay(room, writer, message.get("since", 0))
+                else:
+                    self._send_error(writer, f"Unknown message type: {kind}")
+        except (ConnectionError, ValueError):
+            # ValueError: line longer than MAX_LINE_BYTES
+            pass
+        finally:
+            if room is not None and room.writers.get(player) is writer:
+                del room.writers[player]
+                # A player leaving on their turn passes it on instead of stalling the room
+                if room.started and not room.over and player == room.turn and room.writers:
+                    self._pass_turn(room, self._next_turn(room))
+                self._close_room_if_idle(room)
+            writer.close()
+
+    def _join(self, message, writer):
+        """Seat a new player, or reattach a returning one and replay what they missed"""
+        name = str(message.get("player", "")).strip()
+        room_name = str(message.get("room", "")).strip()
+        if not name or not room_name:
+            self._send_error(writer, "Player and room names are required")
+            return None, None
+
+        room = self.rooms.get(room_name)
+        if room is None:
+            pairs = message.get("pairs") or []
+            if not isinstance(pairs, list) or not all(_is_pair(pair) for pair in pairs):
+                self._send_error(writer, "Pairs must be [term, definition] strings")
+                return None, None
+            if len(pairs) < 2:
+                self._send_error(writer, "A new room needs at least 2 pairs")
+                return None, None
+            seats = message.get("seats", MIN_SEATS)
+            if not isinstance(seats, int) or isinstance(seats, bool):
+                self._send_error(writer, "Seats must be a whole number")
+                return None, None
+            seats = min(MAX_SEATS, max(MIN_SEATS, seats))
+            room = self.rooms[room_name] = Room(room_name, [tuple(pair) for pair in pairs], seats)
+
+        new_player = name not in room.players
+        if not new_player:
+            index = room.players.index(name)
+            previous = room.writers.get(index)
+            if previous is not None and previous is not writer:
+                # A live seat is only handed over to the client it was issued to
+                if message.get("token") != room.tokens[index]:
+                    self._send_error(writer, "Name already taken")
+                    return None, None
+                previous.close()
+        elif len(room.players) >= room.seats:
+            self._send_error(writer, "Room is full")
+            return None, None
+        else:
+            index = len(room.players)
+            room.players.append(name)
+            room.scores.append(0)
+            room.tokens.append(secrets.token_hex(16))
+
+        writer.write(_encode({"type": "welcome", "room": room.name, "index": index,
+                              "cards": room.cards, "seats": room.seats,
+                              "token": room.tokens[index]}))
+        self._replay(room, writer, message.get("since", 0))
+        room.writers[index] = writer
+        # Everyone left and the turn holder is still away; the returning player goes on
+        if room.started and not room.over and room.turn not in room.writers:
+            self._pass_turn(room, index)
+
+        if new_player:
+            self._broadcast(room, {"type": "join", "player": name, "index": index})
+        if not room.started and len(room.players) == room.seats:
+            room.started = True
+            self._broadcast(room, {"type": "start", "players": room.players, "turn": room.turn})
+        return room, index
+
+    def _flip(self, room, player, card, writer):
+        """Apply one card flip from the player whose turn it is"""
+        if not room.started or room.over:
+            self._send_error(writer, "The game is not running")
+            return
+        if player != room.turn:
+            self._send_error(writer, "Not your turn")
+            return
+        key = f"block_{card}"
+        if not isinstance(card, int) or key not in room.logic.blocks or card == room.first:
+            self._send_error(writer, "Invalid card")
+            return
+
+        self._broadcast(room, {"type": "flip", "card": card, "value": room.logic.get_value(key),
+                               "player": player})
+        if room.first is None:
+            room.first = card
+            return
+
+        first, room.first = room.first, None
+        first_key = f"block_{first}"
+        if room.logic.check_match(room.logic.get_value(first_key), room.logic.get_value(key)):
+            room.logic.remove_blocks(first_key, key)
+            room.scores[player] += 1
+            self._broadcast(room, {"type": "match", "cards": [first, card], "player": player,
+                                   "scores": room.scores})
+            if room.logic.has_won():
+                room.over = True
+                self._broadcast(room, {"type": "over", "scores": room.scores})
+        else:
+            room.turn = self._next_turn(room)
+            self._broadcast(room, {"type": "miss", "cards": [first, card], "turn": room.turn})
+
+    def _pass_turn(self, room, turn):
+        """Hand the turn on, turning back a card the previous player left face up"""
+        cards = [] if room.first is None else [room.first]
+        room.first = None
+        room.turn = turn
+        self._broadcast(room, {"type": "pass", "cards": cards, "turn": turn})
+
+    def _next_turn(self, room):
+        """Next connected player after the current one (or simply the next seat)"""
+        count = len(room.players)
+        for step in range(1, count + 1):
+            candidate = (room.turn + step) % count
+            if candidate in room.writers:
+                return candidate
+        return (room.turn + 1) % count
+
+    def _broadcast(self, room, message):
+        data = room.record(message)
+        for writer in list(room.writers.values()):
+            # A client that stops reading is dropped; it can resync later
+            if writer.transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+                writer.close()
+            else:
+                writer.write(data)
+
+    def _replay(self, room, writer, since):
+        """Resend every delta after sequence number `since`"""
+        since = since if isinstance(since, int) and since > 0 else 0
+        if since < len(room.log):
+            writer.write(b"".join(room.log[since:]))
+
+    def _send_error(self, writer, text):
+        writer.write(_encode({"type": "error", "message": text}))
+
+    def _close_room_if_idle(self, room):
+        if not room.writers and (room.over or not room.started):
+            self.rooms.pop(room.name, None)
+
+class GameClient:
+    def __init__(self, host, port, room, player, pairs=None, seats=MIN_SEATS):
+        self.host = host
+        self.port = port
+        self.room = room
+        self.player = player
+        self.pairs = pairs
+        self.seats = seats
+        self.last_seq = 0
+        self.token = None
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        """Connect (or reconnect) and ask for every delta after the last one seen"""
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port,
+                                                                 limit=MAX_LINE_BYTES)
+        await self._send({"type": "join", "room": self.room, "player": self.player,
+                          "pairs": self.pairs, "seats": self.seats, "since": self.last_seq,
+                          "token": self.token})
+
+    async def flip(self, card):
+        await self._send({"type": "flip", "card": card})
+
+    async def receive(self):
+        """Return the next new message, skipping duplicates and repairing gaps"""
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("Host closed the connection")
+            message = json.loads(line)
+            seq = message.get("seq")
+            if seq is None:
+                if message.get("type") == "welcome":
+                    # Proves on reconnect that the seat is ours
+                    self.token = message.get("token")
+                return message
+            if seq <= self.last_seq:
+                continue
+            if seq > self.last_seq + 1:
+                await self._send({"type": "resync", "since": self.last_seq})
+                continue
+            self.last_seq = seq
+            return message
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+
+    async def _send(self, message):
+        if self.writer is None:
+            raise ConnectionError("Not connected to a host")
+        self.writer.write(_encode(message))
+        await self.writer.drain()
+
+class HostThread:
+    def __init__(self, host="0.0.0.0", port=DEFAULT_PORT):
+        self.host = GameHost(host, port)
+        self.loop = asyncio.new_event_loop()
+        self.error = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="memo-host")
+
+    def start(self, timeout=5):
+        """Start the host in the background; raises if the port cannot be bound"""
+        self._thread.start()
+        self._ready.wait(timeout)
+        if self.error:
+            raise self.error
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.host.start())
+        except OSError as e:
+            self.error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        self.loop.run_forever()
+        self.loop.run_until_complete(self.host.close())
+        self.loop.close()
+
+    def stop(self):
+        if self._thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+class ClientThread:
+    def __init__(self, client):
+        self.client = client
+        self.events = queue.Queue()
+        self.loop = asyncio.new_event_loop()
+        self._closing = False
+        self._task = None
+        self._thread = threading.Thread(target=self._run, daemon=True, name="memo-client")
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self._task = self.loop.create_task(self._main())
+        try:
+            self.loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        self.loop.run_until_complete(self.client.close())
+        self.loop.close()
+
+    async def _main(self):
+        """Receive deltas forever, reconnecting and resyncing after drops"""
+        while not self._closing:
+            try:
+                await self.client.connect()
+                while True:
+                    self.events.put(await self.client.receive())
+            except (OSError, ConnectionError, ValueError):
+                await self.client.close()
+                self.events.put({"type": "disconnected"})
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    def flip(self, card):
+        """Send a flip from the Tk thread"""
+        if self.client.writer is not None:
+            asyncio.run_coroutine_threadsafe(self.client.flip(card), self.loop)
+
+    def close(self):
+        self._closing = True
+        if self._task is not None:
+            self.loop.call_soon_threadsafe(self._task.cancel)
+
+def main():
+    parser = argparse.ArgumentParser(description="Host networked Memo Trainer games")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    host = GameHost(args.host, args.port)
+    try:
+        asyncio.run(host.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import json
+import os
+from bisect import insort
+
+# Suggestions kept at every trie node, so completion never walks the subtree
+COMPLETION_LIMIT = 8
+
+def normalize_name(name):
+    """Key that merges names differing only in case or spacing"""
+    return " ".join(name.split()).casefold()
+
+class PlayerRegistry:
+    def __init__(self, filename="players.json"):
+        self.filename = filename
+        self.names = {}
+        self.ids = {}
+        self._trie = {}
+        self._load_players()
+
+    def _load_players(self):
+        """Load players from file and rebuild the prefix index"""
+        if not os.path.exists(self.filename):
+            return
+
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading players: {e}")
+            return
+
+        for player_id, name in data.items():
+            self._index(player_id, name)
+
+    def _save_players(self):
+        """Save players to file"""
+        try:
+            tmp_name = self.filename + ".tmp"
+            with open(tmp_name, 'w', encoding='utf-8') as f:
+                json.dump(self.names, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_name, self.filename)
+        except Exception as e:
+            print(f"Error saving players: {e}")
+
+    def _index(self, player_id, name):
+        key = normalize_name(name)
+        self.names[player_id] = name
+        self.ids[key] = player_id
+
+        node = self._trie
+        for char in key:
+            node = node.setdefault(char, {})
+            suggestions = node.setdefault(None, [])
+            if len(suggestions) < COMPLETION_LIMIT or key < suggestions[-1][0]:
+                insort(suggestions, (key, player_id))
+                del suggestions[COMPLETION_LIMIT:]
+
+    def register(self, name):
+        """Return the id for a player name, creating the player if needed"""
+        return self.register_many([name])[name]
+
+    def register_many(self, names):
+        """Map several names to ids, saving the registry at most once"""
+        ids = {}
+        added = False
+        for name in names:
+            player_id = self.lookup(name)
+            if player_id is None:
+                player_id = f"p{len(self.names) + 1}"
+                self._index(player_id, " ".join(name.split()))
+                added = True
+            ids[name] = player_id
+        if added:
+            self._save_players()
+        return ids
+
+    def lookup(self, name):
+        """Id of a player name, or None if it was never registered"""
+        return self.ids.get(normalize_name(name))
+
+    def name(self, player_id):
+        """Display name of a player id"""
+        return self.names.get(player_id)
+
+    def complete(self, prefix, limit=COMPLETION_LIMIT):
+        """Registered names starting with prefix, alphabetically"""
+        node = self._trie
+        for char in normalize_name(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        if node is self._trie:
+            return []
+        return [self.names[player_id] for _, player_id in node[None][:limit]]
@@ -0,0 +1,115 @@
+import time
+import tkinter as tk
+import tkinter.font as tkFont
+from app.confusion import ConfusionTracker
+from app.images import ImageCache
+from app.leaderboard import LeaderboardManager
+from app.metrics import metrics_from_env, timer
+from app.players import PlayerRegistry
+from app.template_registry import TemplateRegistry
+from app.text_layout import FONT_FAMILY, FontRegistry, TextFitter
+
+# Memory budget for decoded card pictures, shared by every seat in the process
+IMAGE_CACHE_BUDGET = 32 * 1024 * 1024
+
+# Instrumentation: event-loop lag probe interval and metrics file flush interval
+LAG_PROBE_MS = 100
+METRICS_DUMP_MS = 10000
+
+class TickScheduler:
+    def __init__(self, root, interval_ms=1000):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._callbacks = []
+        self._after_id = None
+
+    def add(self, callback):
+        """Call callback on every tick until it is discarded"""
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def discard(self, callback):
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+        if not self._callbacks and self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        """One after() chain drives the timers of every seat"""
+        self._after_id = None
+        for callback in list(self._callbacks):
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in timer callback: {e}")
+        if self._callbacks:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+class SharedResources:
+    def __init__(self, root=None):
+        self.root = root or tk.Tk()
+        self.seats = []
+
+        # Improved font configuration
+        default_font = tkFont.nametofont("TkDefaultFont")
+        default_font.configure(family=FONT_FAMILY, size=11)
+        self.root.option_add("*Font", default_font)
+
+        # Shared named fonts and memoized card text fitting
+        self.fonts = FontRegistry(self.root)
+        self.card_fitter = TextFitter(self.fonts)
+        self.card_pixel = tk.PhotoImage(master=self.root, width=1, height=1)
+
+        # Picture cards are decoded off the UI thread and kept in an LRU cache
+        self.images = ImageCache(self.root, budget_bytes=IMAGE_CACHE_BUDGET)
+        self.clock = TickScheduler(self.root)
+
+        # Opt-in instrumentation (MEMO_METRICS_FILE / MEMO_METRICS_PORT)
+        self.metrics = metrics_from_env()
+
+        self.players = PlayerRegistry()
+        with timer(self.metrics, "memo_leaderboard_io_ms", op="load"):
+            self.leaderboard = LeaderboardManager(players=self.players)
+        self.templates = TemplateRegistry()
+        self.confusion = ConfusionTracker()
+
+        if self.metrics:
+            self.metrics.serve()
+            self._probe_event_loop_lag()
+            self._dump_metrics()
+
+    def attach(self, seat):
+        self.seats.append(seat)
+
+    def detach(self, seat):
+        """Forget a closed seat; the process ends with the last one"""
+        if seat in self.seats:
+            self.seats.remove(seat)
+        if not self.seats:
+            self.root.destroy()
+
+    def _probe_event_loop_lag(self):
+        """Measure how late after() callbacks fire compared with their schedule"""
+        expected = time.perf_counter() + LAG_PROBE_MS / 1000
+
+        def probe():
+            lag = max(0.0, time.perf_counter() - expected) * 1000
+            self.metrics.observe("memo_event_loop_lag_ms", lag)
+            self._probe_event_loop_lag()
+
+        self.root.after(LAG_PROBE_MS, probe)
+
+    def _dump_metrics(self):
+        """Periodically flush metrics to the configured file"""
+        self.metrics.dump()
+        self.root.after(METRICS_DUMP_MS, self._dump_metrics)
+
+    def run(self):
+        """Run the Tk loop until every seat is closed"""
+        self.root.mainloop()
+        self.images.close()
+        if self.metrics:
+            self.metrics.close()
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import marshal
+import os
+from app.cache import LRUCache
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+def default_cache_dir():
+    """Per-user cache directory for precompiled decks"""
+    base = (os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "memo-trainer", "templates")
+
+def template_name(stem):
+    """Display name of a deck file: world_capitals -> World Capitals"""
+    return " ".join(word[:1].upper() + word[1:] for word in stem.split("_"))
+
+class TemplateRegistry:
+    def __init__(self, directory=TEMPLATE_DIR, cache_dir=None, maxsize=8):
+        self.directory = directory
+        self.cache_dir = cache_dir or default_cache_dir()
+        self._files = None
+        self._decks = LRUCache(maxsize)
+
+    def _discover(self):
+        """Map display names to deck files; only the directory is listed"""
+        files = {}
+        try:
+            for entry in os.scandir(self.directory):
+                stem, ext = os.path.splitext(entry.name)
+                if ext == ".json":
+                    files[template_name(stem)] = entry.path
+        except Exception as e:
+            print(f"Error listing templates: {e}")
+        return files
+
+    def names(self):
+        """Names of the available decks, without loading any of them"""
+        if self._files is None:
+            self._files = self._discover()
+        return sorted(self._files)
+
+    def get(self, name):
+        """Pairs of a deck, or an empty list for unknown names like Custom"""
+        pairs = self._decks.get(name)
+        if pairs is None:
+            if self._files is None:
+                self._files = self._discover()
+            if name not in self._files:
+                return []
+            pairs = self._load(self._files[name])
+            self._decks.put(name, pairs)
+        return pairs
+
+    def _load(self, filename):
+        """Read a deck, reusing the precompiled copy when its content is unchanged"""
+        try:
+            with open(filename, 'rb') as f:
+                data = f.read()
+        except Exception as e:
+            print(f"Error loading template {filename}: {e}")
+            return []
+
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        cache_file = os.path.join(self.cache_dir, f"{digest}.v{marshal.version}.marshal")
+        try:
+            with open(cache_file, 'rb') as f:
+                return marshal.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error reading template cache {cache_file}: {e}")
+
+        try:
+            pairs = [(str(term), str(definition)) for term, definition in json.loads(data.decode('utf-8'))]
+        except Exception as e:
+            print(f"Error parsing template {filename}: {e}")
+            return []
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_name = cache_file + ".tmp"
+            with open(tmp_name, 'wb') as f:
+                marshal.dump(pairs, f)
+            os.replace(tmp_name, cache_file)
+        except Exception as e:
+            print(f"Error writing template cache: {e}")
+        return pairs
@@ -0,0 +1,104 @@
+import tkinter as tk
+import tkinter.font as tkFont
+from app.cache import LRUCache
+
+FONT_FAMILY = "Segoe UI"
+
+# Card font sizes tried from largest to smallest when fitting text
+CARD_FONT_SIZES = (16, 14, 12, 11, 10, 9, 8, 7)
+
+class FontRegistry:
+    def __init__(self, root, family=FONT_FAMILY):
+        self.root = root
+        self.family = family
+        self._fonts = {}
+
+    def get(self, size, *styles):
+        """Return the shared named font for a size and style combination"""
+        key = (size,) + styles
+        font = self._fonts.get(key)
+        if font is None:
+            name = "memo-" + "-".join(str(part) for part in key)
+            try:
+                font = tkFont.Font(root=self.root, name=name, family=self.family, size=size,
+                                   weight="bold" if "bold" in styles else "normal",
+                                   slant="italic" if "italic" in styles else "roman")
+            except tk.TclError:
+                # Another window in this interpreter already created it
+                font = tkFont.Font(root=self.root, name=name, exists=True)
+            self._fonts[key] = font
+        return font
+
+class TextFitter:
+    def __init__(self, fonts, sizes=CARD_FONT_SIZES, styles=("bold",), maxsize=4096):
+        self.fonts = fonts
+        self.sizes = sizes
+        self.styles = styles
+        self._measures = LRUCache(maxsize)
+        self._line_counts = LRUCache(maxsize)
+        self._fits = LRUCache(maxsize)
+        self._linespace = {}
+
+    def measure(self, text, font):
+        """Pixel width of a single line of text, memoized"""
+        key = (text, str(font))
+        width = self._measures.get(key)
+        if width is None:
+            width = font.measure(text)
+            self._measures.put(key, width)
+        return width
+
+    def linespace(self, font):
+        """Pixel height of one line of text in the given font"""
+        name = str(font)
+        if name not in self._linespace:
+            self._linespace[name] = font.metrics("linespace")
+        return self._linespace[name]
+
+    def count_lines(self, text, font, width):
+        """Number of lines Tk needs to show text wrapped at width pixels"""
+        key = (text, str(font), width)
+        lines = self._line_counts.get(key)
+        if lines is None:
+            lines = self._wrap(text, font, width)
+            self._line_counts.put(key, lines)
+        return lines
+
+    def _wrap(self, text, font, width):
+        """Emulate Tk word wrapping, breaking words wider than a line"""
+        space = self.measure(" ", font)
+        lines = 0
+        for paragraph in text.split("\n"):
+            lines += 1
+            used = 0
+            for word in paragraph.split():
+                word_width = self.measure(word, font)
+                if used and used + space + word_width > width:
+                    lines += 1
+                    used = 0
+                elif used:
+                    used += space
+                if word_width > width:
+                    extra, used = divmod(word_width, max(1, width))
+                    lines += extra
+                else:
+                    used += word_width
+        return lines
+
+    def fit(self, text, width, height):
+        """Return (font, wraplength) that shows text inside a width x height box"""
+        key = (text, width, height)
+        result = self._fits.get(key)
+        if result is None:
+            result = self._fit(text, width, height)
+            self._fits.put(key, result)
+        return result
+
+    def _fit(self, text, width, height):
+        font = None
+        for size in self.sizes:
+            font = self.fonts.get(size, *self.styles)
+            if self.count_lines(text, font, width) * self.linespace(font) <= height:
+                break
+        # Fall back to the smallest size; Tk clips whatever still overflows
+        return font, width
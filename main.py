@@ -1,5 +1,19 @@
+import argparse
 from app.gui import MemoryGameGUI
+from app.seats import SharedResources
 
 if __name__ == "__main__":
-    app = MemoryGameGUI()
-    app.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Memo Trainer")
+    parser.add_argument("--seats", type=int, default=1,
+                        help="open this many independent game windows in one process")
+    args = parser.parse_args()
+
+    if args.seats > 1:
+        shared = SharedResources()
+        shared.root.withdraw()
+        for seat in range(1, args.seats + 1):
+            MemoryGameGUI(shared, seat)
+        shared.run()
+    else:
+        app = MemoryGameGUI()
+        app.run()
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import unittest
+from app.network import GameClient, GameHost
+
+PAIRS = [("a", "1"), ("b", "2"), ("c", "3")]
+
+async def start_host():
+    host = GameHost("127.0.0.1", 0)
+    await host.start()
+    return host
+
+async def join(host, player, room="room"):
+    client = GameClient("127.0.0.1", host.port, room, player, pairs=PAIRS, seats=2)
+    await client.connect()
+    return client
+
+async def receive_until(client, kind):
+    """Skip messages until one of the given type arrives"""
+    while True:
+        message = await asyncio.wait_for(client.receive(), 2)
+        if message["type"] == kind:
+            return message
+
+async def start_game(host):
+    first = await join(host, "alice")
+    second = await join(host, "bob")
+    await receive_until(first, "start")
+    await receive_until(second, "start")
+    return first, second
+
+def cards_that_miss(host, room="room"):
+    """Two card numbers whose values are not a pair, read from the host's board"""
+    logic = host.rooms[room].logic
+    values = [logic.blocks[f"block_{i}"] for i in range(len(logic.blocks))]
+    for second in range(1, len(values)):
+        if not logic.check_match(values[0], values[second]):
+            return 0, second
+
+async def raw_join(host, message):
+    reader, writer = await asyncio.open_connection("127.0.0.1", host.port)
+    writer.write((json.dumps(message) + "\n").encode('utf-8'))
+    reply = json.loads(await asyncio.wait_for(reader.readline(), 2))
+    writer.close()
+    return reply
+
+class GameHostTest(unittest.TestCase):
+    def run_async(self, scenario):
+        async def main():
+            host = await start_host()
+            try:
+                await asyncio.wait_for(scenario(host), 10)
+            finally:
+                await host.close()
+        asyncio.run(main())
+
+    def test_join_welcome_and_start(self):
+        async def scenario(host):
+            first = await join(host, "alice")
+            welcome = await first.receive()
+            self.assertEqual((welcome["type"], welcome["index"], welcome["cards"]), ("welcome", 0, 6))
+            self.assertEqual((await first.receive())["type"], "join")
+
+            second = await join(host, "bob")
+            self.assertEqual((await second.receive())["index"], 1)
+            start = await receive_until(second, "start")
+            self.assertEqual((start["players"], start["turn"]), (["alice", "bob"], 0))
+            self.assertEqual((await receive_until(first, "start"))["seq"], start["seq"])
+        self.run_async(scenario)
+
+    def test_miss_passes_turn(self):
+        async def scenario(host):
+            first, second = await start_game(host)
+            card1, card2 = cards_that_miss(host)
+            await first.flip(card1)
+            await first.flip(card2)
+            miss = await receive_until(second, "miss")
+            self.assertEqual((miss["cards"], miss["turn"]), ([card1, card2], 1))
+        self.run_async(scenario)
+
+    def test_flip_out_of_turn_is_rejected(self):
+        async def scenario(host):
+            first, second = await start_game(host)
+            await second.flip(0)
+            error = await receive_until(second, "error")
+            self.assertEqual(error["message"], "Not your turn")
+            self.assertIsNone(host.rooms["room"].first)
+        self.run_async(scenario)
+
+    def test_dropped_client_resyncs_missed_deltas(self):
+        async def scenario(host):
+            first, second = await start_game(host)
+            await second.close()
+            card1, card2 = cards_that_miss(host)
+            await first.flip(card1)
+            await first.flip(card2)
+            await receive_until(first, "miss")
+
+            last_seq = second.last_seq
+            await second.connect()
+            self.assertEqual((await second.receive())["type"], "welcome")
+            replayed = [await second.receive() for _ in range(3)]
+            self.assertEqual([m["type"] for m in replayed], ["flip", "flip", "miss"])
+            self.assertEqual([m["seq"] for m in replayed], [last_seq + 1, last_seq + 2, last_seq + 3])
+        self.run_async(scenario)
+
+    def test_turn_passes_when_player_on_turn_leaves(self):
+        async def scenario(host):
+            first, second = await start_game(host)
+            await first.flip(0)
+            await receive_until(second, "flip")
+            await first.close()
+            passed = await receive_until(second, "pass")
+            self.assertEqual((passed["cards"], passed["turn"]), ([0], 1))
+
+            await second.flip(0)
+            self.assertEqual((await receive_until(second, "flip"))["player"], 1)
+        self.run_async(scenario)
+
+    def test_returning_player_takes_turn_of_absent_holder(self):
+        async def scenario(host):
+            first, second = await start_game(host)
+            await second.close()
+            await first.close()
+            await asyncio.sleep(0.1)
+
+            await second.connect()
+            passed = await receive_until(second, "pass")
+            self.assertEqual(passed["turn"], 1)
+        self.run_async(scenario)
+
+    def test_duplicate_name_does_not_take_a_live_seat(self):
+        async def scenario(host):
+            first = await join(host, "marco")
+            await receive_until(first, "join")
+            impostor = await join(host, "marco")
+            error = await receive_until(impostor, "error")
+            self.assertEqual(error["message"], "Name already taken")
+
+            await join(host, "bob")
+            start = await receive_until(first, "start")
+            self.assertEqual(start["players"], ["marco", "bob"])
+        self.run_async(scenario)
+
+    def test_resume_token_takes_over_a_live_seat(self):
+        async def scenario(host):
+            first, second = await start_game(host)
+            # Reconnect while the host still holds the old connection
+            stale = second.reader
+            second.writer = None
+            await second.connect()
+            welcome = await receive_until(second, "welcome")
+            self.assertEqual(welcome["index"], 1)
+            await asyncio.wait_for(stale.read(), 2)
+            self.assertTrue(stale.at_eof())
+        self.run_async(scenario)
+
+    def test_malformed_joins_get_an_error(self):
+        async def scenario(host):
+            base = {"type": "join", "room": "bad", "player": "eve", "pairs": PAIRS, "seats": 2}
+            for bad in ({"seats": None}, {"seats": "lots"}, {"seats": True},
+                        {"pairs": [[["a"], "1"], ["b", "2"]]}, {"pairs": [1, 2]},
+                        {"pairs": "ab"}, {"pairs": [["a", "1", "x"], ["b", "2"]]}):
+                reply = await raw_join(host, {**base, **bad})
+                self.assertEqual(reply["type"], "error", bad)
+            self.assertNotIn("bad", host.rooms)
+
+            reply = await raw_join(host, base)
+            self.assertEqual(reply["type"], "welcome")
+        self.run_async(scenario)
+
+if __name__ == "__main__":
+    unittest.main()